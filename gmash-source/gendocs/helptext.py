@@ -15,14 +15,13 @@ Copyright(c) 2025 Anton Yashchenko
 #-----------------------------------------------------------------------------#
 """
 
+import re
 import sys
-from helptext_common import  print_error
+from helptext_common import  print_error, COLOR_BOLD, COLOR_RESET
 from helptext_ast import Tk, Ast, print_ascii_tree, print_ascii_tree_simple
 from helptext_parser import parse
-from helptext_md import generate_md
-from helptext_tests import run_unit_tests, CMNH_TEST_MAP
 
-_TITLE = "\033[1mhelptext\033[0m"
+_TITLE = COLOR_BOLD + "helptext" + COLOR_RESET
 _VERSION = "v0.0.0"
 _LICENSE = "AGPL-3.0-or-later\nCopyright(c) 2025 Anton Yashchenko"
 _BASE_HELP_TEXT = """Usage:
@@ -33,6 +32,7 @@ _BASE_HELP_TEXT = """Usage:
 Generate formatted markdown documentation from command line help text.
 Pass help text to parse. If not provided, will check stdin for piped input.
 Prints generated markdown to stdout or to the provided output file.
+Long options taking a value also accept the `--option=<value>` form.
 See "Command Line Help Notation" grammar for details on accepted help text formats.
 
 Parameters:
@@ -57,6 +57,33 @@ Developer Arguments:
 """
 _HELP_TEXT = _TITLE + "\n" + _VERSION + "\n" + _LICENSE + "\n\n" + _BASE_HELP_TEXT
 
+# `print` output of the help and version texts, built once.
+_HELP_TEXT_OUT = _HELP_TEXT + "\n"
+_VERSION_OUT = _VERSION + "\n"
+
+_FLAG_HELP = 1      # -h, --help
+_FLAG_VERSION = 2   # -v, --version
+_FLAG_TEST = 4      # -t, --test
+_FLAG_RAW = 8       # -r, --raw
+_FLAG_ASCII = 16    # -a, --ascii
+_FLAG_FANCY = 32    # -f, --fancy
+
+# Boolean command line flags, mapped to their `_FLAG_*` bit.
+_FLAGS = {
+    '-h': _FLAG_HELP, '--help': _FLAG_HELP,
+    '-v': _FLAG_VERSION, '--version': _FLAG_VERSION,
+    '-t': _FLAG_TEST, '--test': _FLAG_TEST,
+    '-r': _FLAG_RAW, '--raw': _FLAG_RAW,
+    '-a': _FLAG_ASCII, '--ascii': _FLAG_ASCII,
+    '-f': _FLAG_FANCY, '--fancy': _FLAG_FANCY,
+}
+
+# Command line options which consume the following arg as their value.
+_VALUE_OPTIONS = frozenset(('-o', '--output', '-s', '--skip'))
+
+# Line boundaries recognized by `str.splitlines`, which the parser splits on.
+_LINE_BREAK_RE = re.compile('\r\n|[\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029]')
+
 class HelpText():
     """ Command line help text to markdown documentation converter.
     """
@@ -72,34 +99,65 @@ class HelpText():
         # No args,no piped input, show help and exit.
         if len(sys.argv) < 2:
             if sys.stdin.isatty():
-                print(_HELP_TEXT)
+                sys.stdout.write(_HELP_TEXT_OUT)
                 sys.exit(0)
 
+        # Single pass over the args, collecting the bits of all passed flags,
+        # the positional args and the value of the first occurrence of each
+        # value option spelling (None if the value is missing).
+        # Values of `-o` and `-s` are not positional. Any other arg starting
+        # with '-' is an unknown option, and exits with an error.
+        flags = 0
+        positional = []
+        option_values = {}
+        is_option_value = False
+        for idx, arg in enumerate(sys.argv[1:], 1):
+            if is_option_value:
+                # Consumed as the value of the previous option.
+                is_option_value = False
+                continue
+            if arg in _FLAGS:
+                flags |= _FLAGS[arg]
+            elif arg in _VALUE_OPTIONS:
+                is_option_value = True
+                option_values.setdefault(arg, sys.argv[idx + 1] if idx + 1 < len(sys.argv) else None)
+            else:
+                option, sep, value = arg.partition('=')
+                if sep and option.startswith('--') and option in _VALUE_OPTIONS:
+                    # `--output=<outputFile>` and `--skip=<lineCount>` forms
+                    option_values.setdefault(option, value)
+                elif arg.startswith('-'):
+                    print_error(f"Unknown option: {arg}",1)
+                    sys.exit(1)
+                else:
+                    positional.append(arg)
+
         # Display help and exit
-        if any(arg == '-h' or arg == '--help' for arg in sys.argv):
-            print(_HELP_TEXT)
+        if flags & _FLAG_HELP:
+            sys.stdout.write(_HELP_TEXT_OUT)
             sys.exit(0)
 
         # Display version and exit
-        if any(arg == '-v' or arg == '--version' for arg in sys.argv):
-            print(_VERSION)
+        if flags & _FLAG_VERSION:
+            sys.stdout.write(_VERSION_OUT)
             sys.exit(0)
 
         # Run unit tests and exit
-        if any(arg == '-t' or arg == '--test' for arg in sys.argv):
-            # Get all args not starting with '-' after the '-t'. If any match, run
+        if flags & _FLAG_TEST:
+            # Imported here so other invocations don't pay for loading the test suite.
+            from helptext_tests import run_unit_tests, CMNH_TEST_LIST, CMNH_TEST_MAP
+            # Positional args are test names or patterns. If any match, run
             # only those tests.
-            test_args = [arg for arg in sys.argv[1:] if not arg.startswith('-')]
-            if len(test_args) > 0:
-                for test_name in test_args:
+            if len(positional) > 0:
+                for test_name in positional:
                     if test_name in CMNH_TEST_MAP:
                         CMNH_TEST_MAP[test_name]()
                     else:
                         # Try finding the first match containing the passed pattern.
-                        matched_tests = [name for name in CMNH_TEST_MAP if test_name in name]
+                        matched_tests = [test for name, test in CMNH_TEST_LIST if test_name in name]
                         if len(matched_tests) > 0:
-                            for match in matched_tests:
-                                CMNH_TEST_MAP[match]()
+                            for test in matched_tests:
+                                test()
                         else:
                             print_error(f"Unknown unit test: {test_name}",1)
             else:
@@ -107,24 +165,20 @@ class HelpText():
             sys.exit(0)
 
         # Enbale printing Ast repr
-        if any(arg == '-r' or arg == '--raw' for arg in sys.argv):
+        if flags & _FLAG_RAW:
             _print_ast_raw = True
-        if any(arg == '-a' or arg == '--ascii' for arg in sys.argv):
+        if flags & _FLAG_ASCII:
             _print_ast_tree = True
-        if any(arg == '-f' or arg == '--fancy' for arg in sys.argv):
+        if flags & _FLAG_FANCY:
             _print_ast_fancy = True
 
 
         # Check for "-o | --output" argument for target output file.
         output_file = None
-        output_index = -1
-        if '--output' in sys.argv:
-            output_index = sys.argv.index('--output')
-        elif '-o' in sys.argv:
-            output_index = sys.argv.index('-o')
-        if output_index != -1:
-            if output_index + 1 < len(sys.argv):
-                output_file = sys.argv[output_index + 1]
+        output_option = '--output' if '--output' in option_values else '-o'
+        if output_option in option_values:
+            if option_values[output_option] is not None:
+                output_file = option_values[output_option]
                 # assrt file is valid
                 try:
                     with open(output_file, 'w',encoding = 'utf-8') as f:
@@ -132,10 +186,6 @@ class HelpText():
                 except Exception as e:
                     print_error(f"Cannot open output file '{output_file}' for writing: {e}",1)
                     sys.exit(1)
-
-                # Remove the -o/--output and the file from args
-                sys.argv.pop(output_index)  # -o | --output
-                sys.argv.pop(output_index)  # file
             else:
                 print_error("No output file provided.",1)
                 sys.exit(1)
@@ -143,54 +193,52 @@ class HelpText():
 
         # Skip first N lines of help text
         lines_to_skip = 0
-        is_skipping = False
-        skip_index = -1
-        if '--skip' in sys.argv:
-            skip_index = sys.argv.index('--skip')
-            is_skipping = True
-        elif '-s' in sys.argv:
-            skip_index = sys.argv.index('-s')
-            is_skipping = True
-        if is_skipping:
-            if skip_index + 1 < len(sys.argv):
+        skip_option = '--skip' if '--skip' in option_values else '-s'
+        if skip_option in option_values:
+            if option_values[skip_option] is not None:
                 try:
-                    skip_count = int(sys.argv[skip_index + 1])
+                    skip_count = int(option_values[skip_option])
                     if skip_count < 0:
                         raise ValueError()
                 except ValueError:
                     print_error("Invalid skip line count provided.",1)
                     sys.exit(1)
-                # Remove the -s and the count from args
-                sys.argv.pop(skip_index)  # -s | --skip
-                sys.argv.pop(skip_index)  # count
                 lines_to_skip = skip_count
             else:
                 print_error("No skip line count provided.",1)
                 sys.exit(1)
 
-        # Pop the script name & remove flags
-        sys.argv.pop(0)
-        sys.argv = [arg for arg in sys.argv if not arg.startswith('-')]
-
-        # If no args left, check stdin for piped input
-        if len(sys.argv) < 1:
+        # If no positional args, check stdin for piped input
+        if len(positional) < 1:
             if not sys.stdin.isatty():
                 help_text = sys.stdin.read()
-                if help_text.strip() == "":
-                    print(_HELP_TEXT)
-                sys.argv.append(help_text)
+                # Normalize `\r\n` and lone `\r` line endings the text layer left untranslated.
+                if '\r' in help_text:
+                    help_text = help_text.replace('\r\n', '\n').replace('\r', '\n')
+                if not help_text or help_text.isspace():
+                    sys.stdout.write(_HELP_TEXT_OUT)
+                positional.append(help_text)
         else:
-            help_text = sys.argv[0]
-        if help_text.strip() == "":
+            help_text = positional[0]
+        if not help_text or help_text.isspace():
             sys.exit(0)
 
         # Skip first N lines if requested
         if lines_to_skip > 0:
-            help_text_lines = help_text.splitlines()
-            if lines_to_skip >= len(help_text_lines):
+            # Find the end of the skipped lines and slice once, instead of
+            # splitting and re-joining the whole text. Lines end where
+            # `splitlines` would split them, so skip and parse agree.
+            skipped = 0
+            skip_end = 0
+            for line_break in _LINE_BREAK_RE.finditer(help_text):
+                skipped += 1
+                skip_end = line_break.end()
+                if skipped == lines_to_skip:
+                    break
+            if skipped < lines_to_skip or skip_end >= len(help_text):
                 print_error("Skip line count exceeds total help text line count.",1)
                 sys.exit(1)
-            help_text = "\n".join(help_text_lines[lines_to_skip:])
+            help_text = help_text[skip_end:]
 
         # Parse
         parse_res = parse(help_text)
@@ -209,6 +257,7 @@ class HelpText():
             print_ascii_tree(parse_res.get_ast())
             sys.exit(0)
 
+        from helptext_md import generate_md
         gen_res = generate_md(parse_res.get_ast())
         if gen_res.is_error():
             print_error(gen_res.get_error(),1)
@@ -238,7 +287,7 @@ class HelpText():
             return Ast(Tk.POSION, parse_res.error)
         return parse_res.get_ast()
 
-    def gen(self, ast) -> tuple[bool,str]:
+    def gen(self, ast: Ast) -> tuple[bool,str]:
         """ Generate `Markdown` documentation from the provided `Ast`.
         On error, returns an empty string.
         Error messages are piped to stderr by default.
@@ -252,6 +301,7 @@ class HelpText():
                 - bool : True if generation was successful, False on error.
                 - str  : Generated markdown docs if successful, error message otherwise.
         """
+        from helptext_md import generate_md
         gen_res = generate_md(ast)
         if gen_res.is_error():
             return (False,gen_res.get_error())
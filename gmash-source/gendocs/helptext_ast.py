@@ -13,11 +13,13 @@ Copyright(c) 2025 Anton Yashchenko
 #-----------------------------------------------------------------------------#
 """
 import enum
+import sys
 import typing
 
 class Tk(enum.Enum):
     """ Token type for an `Ast` node.
         To simplify parsing logic: there is no tokenizer step.
+        - Members are singletons, compare them by identity (`is`).
     """
     NOTHING = enum.auto()           # Empty node
     POSION = enum.auto()            # Error node, value is the error message
@@ -41,6 +43,8 @@ class Tk(enum.Enum):
 
 class Ast:
     """ Abstract syntax tree. """
+    __slots__ = ('tk', 'value', 'line', 'col', 'end_line', 'end_col', 'branches')
+
     def __init__(self,
                              tk: Tk = Tk.NOTHING,
                              value: typing.Optional[str] = None,
@@ -61,76 +65,98 @@ class Ast:
     def append(self, br: 'Ast') -> 'Ast':
         """ Append a branch to this AST node and return the appended branch. """
         self.branches.append(br)
-        return self.branches[-1]
+        return br
 
     def __repr__(self) -> str:
         return f'Ast({self.tk}, {self.value}, {self.branches})'
 
     def __eq__(self, other: object) -> bool:
+        """ Structural equality (ignores source positions).
+            - Compares node pairs with an explicit stack instead of recursing
+              through `list.__eq__` for each level of branches.
+        """
+        if self is other:
+            return True
         if not isinstance(other, Ast):
             return NotImplemented
-        return (self.tk == other.tk and
-                self.value == other.value and
-                #self.line == other.line and
-                #self.col == other.col and
-                #self.end_line == other.end_line and
-                #self.end_col == other.end_col and
-                self.branches == other.branches)
+        stack : typing.List[typing.Tuple[Ast,Ast]] = [(self, other)]
+        while stack:
+            lhs, rhs = stack.pop()
+            if lhs is rhs:
+                continue
+            if not isinstance(rhs, Ast):
+                return False
+            if (lhs.tk is not rhs.tk or
+                lhs.value != rhs.value or
+                #lhs.line != rhs.line or
+                #lhs.col != rhs.col or
+                #lhs.end_line != rhs.end_line or
+                #lhs.end_col != rhs.end_col or
+                len(lhs.branches) != len(rhs.branches)):
+                return False
+            stack.extend(zip(lhs.branches, rhs.branches))
+        return True
 
 
-# pylint: disable=W0613
 def print_ascii_tree(astnode: Ast, prefix: str = "", is_last: bool = True) -> None:
-# pylint: enable=W0613
-    """Print the AST as a compact ASCII tree with boxes and connection lines"""
-    content = astnode.tk.name + " : " + astnode.value if astnode.value is not None else astnode.tk.name
-    lines = content.split('\n')
-    max_width = max(len(line) for line in lines) if lines else 0
-
-    box_lines = []
-    box_lines.append("┌" + "─" * (max_width + 2) + "┐")
-    for line in lines:
-        box_lines.append("│ " + line.ljust(max_width) + " │")
-    box_lines.append("└" + "─" * (max_width + 2) + "┘")
-
-    for i, line in enumerate(box_lines):
-        print(prefix + line)
-
-    if astnode.branches:
-        for i, child in enumerate(astnode.branches):
-            is_last_child = (i == len(astnode.branches) - 1)
-
-            # Print connection lines
-            if is_last_child:
-                print(prefix + "    │")
-                print(prefix + "    └──────────┐")
-            else:
-                print(prefix + "    │")
-                print(prefix + "    ├──────────┐")
-
-            # Calculate child prefix
-            child_prefix = prefix
+    """Print the AST as a compact ASCII tree with boxes and connection lines.
+        - Walks the tree with an explicit stack and writes the output once.
+    """
+    out : typing.List[str] = []
+    # (node, prefix of the parent box, is last child of the parent)
+    stack : typing.List[typing.Tuple[Ast,str,bool]] = [(astnode, prefix, is_last)]
+    while stack:
+        node, node_prefix, is_last_child = stack.pop()
+
+        # Print connection lines from the parent box, then calculate the node prefix
+        if node is not astnode:
+            out.append(node_prefix + "    │\n")
             if is_last_child:
-                child_prefix += "             "  # Align with the end of connection
+                out.append(node_prefix + "    └──────────┐\n")
+                node_prefix += "             "  # Align with the end of connection
             else:
-                child_prefix += "    │         "  # Continue the vertical line
-
-            # Recursive call to the function (not method)
-            print_ascii_tree(child, child_prefix, is_last_child)
+                out.append(node_prefix + "    ├──────────┐\n")
+                node_prefix += "    │         "  # Continue the vertical line
+
+        content = node.tk.name + " : " + node.value if node.value is not None else node.tk.name
+        if '\n' not in content:
+            # Most nodes are a single line, skip splitting and padding.
+            border = "─" * (len(content) + 2)
+            out.append(f"{node_prefix}┌{border}┐\n{node_prefix}│ {content} │\n{node_prefix}└{border}┘\n")
+        else:
+            lines = content.split('\n')
+            max_width = max(len(line) for line in lines)
+            border = "─" * (max_width + 2)
+            out.append(f"{node_prefix}┌{border}┐\n")
+            for line in lines:
+                out.append(f"{node_prefix}│ {line.ljust(max_width)} │\n")
+            out.append(f"{node_prefix}└{border}┘\n")
+
+        # Push children in reverse so the first child is printed first
+        last = len(node.branches) - 1
+        for i in range(last, -1, -1):
+            stack.append((node.branches[i], node_prefix, i == last))
+    sys.stdout.write("".join(out))
 
 def print_ascii_tree_simple(astnode: Ast, indent: int = 0) -> None:
-    """Simple recursive AST printer with ASCII art"""
-    indent_str = "    " * indent
-    connector = "└── " if indent > 0 else ""
-
-    # Node content
-    content = astnode.tk.name + ': ' + astnode.value if astnode.value is not None else astnode.tk.name
-    print(f"{indent_str}{connector}{content}")
-
-    # Print position info (optional)
-    if astnode.line > 0:
-        print(f"{indent_str}    \
-            [L{astnode.line}:{astnode.col}-L{astnode.end_line}:{astnode.end_col}]")
-
-    # Recursively print children
-    for child in astnode.branches:
-        print_ascii_tree_simple(child, indent + 1)
\ No newline at end of file
+    """Simple AST printer with ASCII art.
+        - Walks the tree with an explicit stack and writes the output once.
+    """
+    out : typing.List[str] = []
+    stack : typing.List[typing.Tuple[Ast,int]] = [(astnode, indent)]
+    while stack:
+        node, depth = stack.pop()
+        indent_str = "    " * depth
+        connector = "└── " if depth > 0 else ""
+
+        # Node content
+        content = node.tk.name + ': ' + node.value if node.value is not None else node.tk.name
+        out.append(f"{indent_str}{connector}{content}\n")
+
+        # Print position info (optional)
+        if node.line > 0:
+            out.append(f"{indent_str}    [L{node.line}:{node.col}-L{node.end_line}:{node.end_col}]\n")
+
+        # Push children in reverse so the first child is printed first
+        stack.extend((child, depth + 1) for child in reversed(node.branches))
+    sys.stdout.write("".join(out))
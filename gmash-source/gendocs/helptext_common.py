@@ -14,18 +14,30 @@ Copyright(c) 2025 Anton Yashchenko
 #-----------------------------------------------------------------------------#
 """
 
-def print_action(msg: str,indent_level : int = 0,indent_type = False) -> None:
+import sys
+
+# ANSI color and style escapes shared by all colorful printers. Decided once at
+# import, empty when stdout is not a terminal so piped output and logs stay plain.
+if sys.stdout is not None and sys.stdout.isatty():
+    COLOR_RED = "\033[91m"
+    COLOR_GREEN = "\033[92m"
+    COLOR_BOLD = "\033[1m"
+    COLOR_RESET = "\033[0m"
+else:
+    COLOR_RED = COLOR_GREEN = COLOR_BOLD = COLOR_RESET = ""
+
+def print_action(msg: str,indent_level : int = 0,indent_type : bool = False) -> None:
     """ Print an action message in green color.
         - indent_level : number of indents to add before the message.
         - indent_type  : set indentation string, False = '└────', True = '    '
     """
     indent_txt = "    " if indent_type else "└────"
-    print("    " * indent_level + indent_txt * (indent_level != 0) + "\033[92m" + msg +"\033[0m")
+    print("    " * indent_level + indent_txt * (indent_level != 0) + COLOR_GREEN + msg + COLOR_RESET)
 
-def print_error(msg: str,indent_level : int  = 0,indent_type = False) -> None:
+def print_error(msg: str,indent_level : int  = 0,indent_type : bool = False) -> None:
     """ Print an error message in red color.
         - indent_level : number of indents to add before the message.
         - indent_type  : set indentation string, False = '└────', True = '    '
     """
     indent_txt = "    " if indent_type else "└────"
-    print("    " * indent_level + indent_txt * (indent_level != 1) + "\033[91m" + msg +"\033[0m")
+    print("    " * indent_level + indent_txt * (indent_level != 1) + COLOR_RED + msg + COLOR_RESET)
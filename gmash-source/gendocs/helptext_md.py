@@ -15,11 +15,13 @@ Copyright(c) 2025 Anton Yashchenko
 #-----------------------------------------------------------------------------#
 """
 
-from typing import Union, List
+from typing import Dict, Union, List
 from helptext_ast import Tk, Ast
 
 class GeneratorResult:
     """GeneratorResult"""
+    __slots__ = ('md', 'error', 'line', 'col')
+
     def __init__(self, res : Union[str,tuple[str,int,int]]) -> None:
         if isinstance(res, str):
             self.md = res
@@ -47,7 +49,7 @@ class GeneratorResult:
 def _generate_argument(arg : Ast) -> GeneratorResult:
     """ Generate markdown documentation for a single argument node.
     """
-    if arg.tk != Tk.ARGUMENT:
+    if arg.tk is not Tk.ARGUMENT:
         return GeneratorResult(("Expected argument node",arg.line,arg.col))
     if len(arg.branches) == 0:
         return GeneratorResult(("Invalid ARGUMENT node format.",arg.line,arg.col))
@@ -55,13 +57,13 @@ def _generate_argument(arg : Ast) -> GeneratorResult:
     outp : str = ""
     # Check for a short flag. Must be first if present.
     next_branch = 0
-    if arg.branches[0].tk == Tk.SHORT_FLAG:
+    if arg.branches[0].tk is Tk.SHORT_FLAG:
         outp += f"`-{arg.branches[next_branch].branches[next_branch].value}` "
         next_branch += 1
 
     # Check for a long flag and any optional/required args.
     has_long_flag : bool = False
-    if next_branch < len(arg.branches) and arg.branches[next_branch].tk == Tk.LONG_FLAG:
+    if next_branch < len(arg.branches) and arg.branches[next_branch].tk is Tk.LONG_FLAG:
         has_long_flag = True
         if len(outp) > 0:
             outp += " "
@@ -71,12 +73,12 @@ def _generate_argument(arg : Ast) -> GeneratorResult:
 
     has_positional : bool = False
     while next_branch < len(arg.branches) \
-            and (arg.branches[next_branch].tk == Tk.OPTIONAL_ARG \
-            or arg.branches[next_branch].tk == Tk.REQUIRED_ARG):
+            and (arg.branches[next_branch].tk is Tk.OPTIONAL_ARG \
+            or arg.branches[next_branch].tk is Tk.REQUIRED_ARG):
         has_positional = True
         if len(outp) > 0:
             outp += " "
-        if arg.branches[next_branch].tk == Tk.OPTIONAL_ARG:
+        if arg.branches[next_branch].tk is Tk.OPTIONAL_ARG:
             outp += f" [{arg.branches[next_branch].branches[0].value}]` "
         else:
             outp += f" <{arg.branches[next_branch].branches[0].value}>` "
@@ -87,13 +89,13 @@ def _generate_argument(arg : Ast) -> GeneratorResult:
         outp += "` "
 
     # Look for any text lines.
-    if next_branch < len(arg.branches) and arg.branches[next_branch].tk != Tk.TEXT_LINE:
+    if next_branch < len(arg.branches) and arg.branches[next_branch].tk is not Tk.TEXT_LINE:
         return GeneratorResult(("Unexpected token in argument list:" \
             + arg.branches[next_branch].tk.name ,arg.line,arg.col))
 
     arg_brief : str = ""
     for text in arg.branches:
-        if text.tk == Tk.TEXT_LINE:
+        if text.tk is Tk.TEXT_LINE:
             arg_brief += "\\\n&nbsp;&nbsp;&nbsp;&nbsp;" + text.value.strip()
     if arg_brief.strip() != "":
         outp += arg_brief
@@ -103,7 +105,7 @@ def _generate_argument(arg : Ast) -> GeneratorResult:
 def _generate_command_section(cmd_section : Ast) -> GeneratorResult:
     """ Generate markdown documentation for a command section node.
     """
-    if cmd_section.tk != Tk.COMMAND_SECTION:
+    if cmd_section.tk is not Tk.COMMAND_SECTION:
         return GeneratorResult(("Expected command section node",cmd_section.line,cmd_section.col))
     if len(cmd_section.branches) == 0:
         return GeneratorResult(("Invalid COMMAND_SECTION node format.",cmd_section.line,cmd_section.col))
@@ -113,7 +115,7 @@ def _generate_command_section(cmd_section : Ast) -> GeneratorResult:
     # -> Command_Section -> Command
     first_cmd = True
     for cmd in cmd_section.branches:
-        if cmd.tk != Tk.COMMAND:
+        if cmd.tk is not Tk.COMMAND:
             return GeneratorResult(("Expected command node",cmd.line,cmd.col))
         if len(cmd.branches) == 0:
             return GeneratorResult(("Invalid COMMAND node format.",cmd.line,cmd.col))
@@ -126,20 +128,20 @@ def _generate_command_section(cmd_section : Ast) -> GeneratorResult:
                 cmd_outp += f"\n`{cmd.value.strip()}` "
         next_branch = 1
         # Expect a text line next.
-        if cmd.branches[0].tk != Tk.TEXT_LINE:
+        if cmd.branches[0].tk is not Tk.TEXT_LINE:
             return GeneratorResult(("Expected text line in command list:" \
                 + cmd.branches[0].tk.name ,cmd.line,cmd.col))
         cmd_outp += "\\\n&nbsp;&nbsp;&nbsp;&nbsp;" + cmd.branches[0].value.strip()
         next_branch += 1
 
         # Check for any sub-commands.
-        while next_branch < len(cmd.branches) and cmd.branches[next_branch].tk == Tk.COMMAND:
+        while next_branch < len(cmd.branches) and cmd.branches[next_branch].tk is Tk.COMMAND:
             sub_cmd = cmd.branches[next_branch]
             if sub_cmd.value is not None and sub_cmd.value.strip() != "":
                 cmd_outp += f"\\\n&nbsp;&nbsp;&nbsp;&nbsp;`{sub_cmd.value.strip()}`"
             next_branch += 1
             # Get the sub-command description.
-            if len(sub_cmd.branches) == 0 or sub_cmd.branches[0].tk != Tk.TEXT_LINE:
+            if len(sub_cmd.branches) == 0 or sub_cmd.branches[0].tk is not Tk.TEXT_LINE:
                 return GeneratorResult(("Expected text line in sub-command list:" \
                     + sub_cmd.branches[0].tk.name if len(sub_cmd.branches) > 0 else "None",sub_cmd.line,sub_cmd.col))
             cmd_outp += "\\\n&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;" + sub_cmd.branches[0].value.strip()
@@ -154,84 +156,86 @@ def generate_md(ast : Ast) -> GeneratorResult:
     outp : List[str] = []
     line = 0
     col = 0
-    if ast.tk != Tk.SYNTAX:
+    if ast.tk is not Tk.SYNTAX:
         return GeneratorResult(("Expected root syntax node",line,col))
 
-    # Find the all usage sections and place them at the top.
+    # Bucket the root branches by kind in a single pass, keeping source order.
+    # Root paragraphs before the first section are collected for the brief.
+    branches_by_tk : Dict[Tk,List[Ast]] = {}
+    brief_paragraphs : List[Ast] = []
+    no_preceding_section = True
     for br in ast.branches:
-        if br.tk == Tk.USAGE:
-            # Extract the first line of usage up to the first occurrence of a flag
-            # and set it as the title of the markdown page.
-            if br.value is not None and br.value.strip() != "":
-                first_line = br.value.split("\n")[0]
-                title : str = ""
-                for idx,ch in enumerate(first_line):
-                    if ch.isspace():
-                        title += " "
-                        if idx + 1 < len(first_line)            \
-                            and (first_line[idx + 1] == "-"     \
-                                or first_line[idx + 1]  == "["  \
-                                or first_line[idx + 1]  == "<"):
-                            break
-                    else:
-                        title += ch
-                outp.append(f"# {title.strip()}\n")
-            outp.append("### Usage")
-            # If there are multiple usage lines, put each on its own line surrounded by backticks.
-            for ln in br.value.split("\n"):
-                if ln.strip() != "":
-                    outp.append(f"`{ln.strip()}`\n")
+        branches_by_tk.setdefault(br.tk,[]).append(br)
+        if br.tk is Tk.SECTION:
+            no_preceding_section = False
+        elif br.tk is Tk.PARAGRAPH and no_preceding_section:
+            brief_paragraphs.append(br)
+
+    # Find the all usage sections and place them at the top.
+    for br in branches_by_tk.get(Tk.USAGE,()):
+        # Extract the first line of usage up to the first occurrence of a flag
+        # and set it as the title of the markdown page.
+        if br.value is not None and br.value.strip() != "":
+            first_line = br.value.split("\n")[0]
+            title : str = ""
+            for idx,ch in enumerate(first_line):
+                if ch.isspace():
+                    title += " "
+                    if idx + 1 < len(first_line)            \
+                        and (first_line[idx + 1] == "-"     \
+                            or first_line[idx + 1]  == "["  \
+                            or first_line[idx + 1]  == "<"):
+                        break
+                else:
+                    title += ch
+            outp.append(f"# {title.strip()}\n")
+        outp.append("### Usage")
+        # If there are multiple usage lines, put each on its own line surrounded by backticks.
+        for ln in br.value.split("\n"):
+            if ln.strip() != "":
+                outp.append(f"`{ln.strip()}`\n")
 
     # Get the brief description if any.
-    for br in ast.branches:
-        if br.tk == Tk.BRIEF:
-            for ln in br.branches[0].branches: # tk.PARAGRAPH
-                outp.append(ln.value.strip())
+    for br in branches_by_tk.get(Tk.BRIEF,()):
+        for ln in br.branches[0].branches: # tk.PARAGRAPH
+            outp.append(ln.value.strip())
 
     # If there is a paragraph at the root level, before any section, its a brief.
-    no_preceding_section = True
-    for br in ast.branches:
-        if br.tk == Tk.PARAGRAPH:
-            if no_preceding_section:
-                outp.append("### Brief")
-                for ln in br.branches:
-                    outp.append(ln.value.strip())
-                outp.append("")
-        elif br.tk == Tk.SECTION:
-            no_preceding_section = False
+    for br in brief_paragraphs:
+        outp.append("### Brief")
+        for ln in br.branches:
+            outp.append(ln.value.strip())
+        outp.append("")
 
     # Handle special case command sections.
-    for br in ast.branches:
-        if br.tk == Tk.COMMAND_SECTION:
-            cmd_section_res = _generate_command_section(br)
-            if cmd_section_res.is_error():
-                return cmd_section_res
-            outp.append(cmd_section_res.get_md())
+    for br in branches_by_tk.get(Tk.COMMAND_SECTION,()):
+        cmd_section_res = _generate_command_section(br)
+        if cmd_section_res.is_error():
+            return cmd_section_res
+        outp.append(cmd_section_res.get_md())
+        outp.append("")
+
+    # -> Section
+    for section in branches_by_tk.get(Tk.SECTION,()):
+        if section.value is not None and section.value.strip() != "":
+            outp.append(f"### {section.value.strip()}")
+        # -> Section -> Paragraph
+        if section.branches[0].tk is Tk.PARAGRAPH:
+            for sec_br in section.branches:
+                if sec_br.tk is Tk.PARAGRAPH:
+                    for ln in sec_br.branches:
+                        outp.append(ln.value.strip())
             outp.append("")
-
-    for br in ast.branches:
-        # -> Section
-        if br.tk == Tk.SECTION:
-            section = br
-            if section.value is not None and section.value.strip() != "":
-                outp.append(f"### {section.value.strip()}")
-            # -> Section -> Paragraph
-            if section.branches[0].tk == Tk.PARAGRAPH:
-                for sec_br in section.branches:
-                    if sec_br.tk == Tk.PARAGRAPH:
-                        for ln in sec_br.branches:
-                            outp.append(ln.value.strip())
+        # -> Section -> Argument_List
+        elif section.branches[0].tk is Tk.ARGUMENT_LIST:
+            arg_list = section.branches[0]
+            if arg_list.value is not None and arg_list.value.strip() != "":
+                outp.append(f"### {arg_list.value.strip()}")
+            # -> Section -> Argument_List -> Argument
+            for arg in arg_list.branches:
+                arg_res = _generate_argument(arg)
+                if arg_res.is_error():
+                    return arg_res
+                outp.append(arg_res.get_md())
                 outp.append("")
-            # -> Section -> Argument_List
-            elif section.branches[0].tk == Tk.ARGUMENT_LIST:
-                arg_list = section.branches[0]
-                if arg_list.value is not None and arg_list.value.strip() != "":
-                    outp.append(f"### {arg_list.value.strip()}")
-                # -> Section -> Argument_List -> Argument
-                for arg in arg_list.branches:
-                    arg_res = _generate_argument(arg)
-                    if arg_res.is_error():
-                        return arg_res
-                    outp.append(arg_res.get_md())
-                    outp.append("")
     return GeneratorResult("\n".join(outp))
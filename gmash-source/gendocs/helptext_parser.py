@@ -17,98 +17,91 @@ Copyright(c) 2025 Anton Yashchenko
     - `parse` function will split input lines and trim all extra whitespace.
 #-----------------------------------------------------------------------------#
 """
-from typing import List, Optional, Union
+import string
+import sys
+from typing import List, NamedTuple, Optional, Union
 from helptext_ast import Ast, Tk
 
 ###############################################################################
 # Parsing Utils
 ###############################################################################
 
+# Character classes of the CMNH grammar. Identifiers are ASCII only, see the EBNF
+# of each parse function.
+_ALPHA_CHARS = frozenset(string.ascii_letters + '_')
+_ALNUMUS_CHARS = frozenset(string.ascii_letters + string.digits + '_')
+_ALNUMDASH_CHARS = frozenset(string.ascii_letters + string.digits + '_-')
+_WHITESPACE_CHARS = frozenset(' \t')
+
 def _is_alnumus(c: str) -> bool:
     """ Is alpha, numeric or underscore."""
-    return c.isalnum() or c == '_'
+    return c in _ALNUMUS_CHARS
 
 def _is_alnumdash(c: str) -> bool:
     """ Is alpha, numeric , underscore or dash."""
-    return c.isalnum() or c == '_' or c == '-'
+    return c in _ALNUMDASH_CHARS
 
 def _is_alpha(c: str) -> bool:
     """ Is alpha or underscore."""
-    return c.isalpha() or c == '_'
+    return c in _ALPHA_CHARS
+
+# Keywords starting a usage section.
+_USAGE_KEYWORDS = ("Usage", "usage", "USAGE")
+
+# Keywords starting a command section, in match order. A keyword that extends
+# an earlier one (e.g. "Commands") is only reached if the earlier one misses.
+_COMMAND_KEYWORDS = (
+    "Command", "command", "COMMAND",
+    "Commands", "commands", "COMMANDS",
+    "Subcommands", "subcommands", "SUBCOMMANDS",
+    "Subcommand", "subcommand", "SUBCOMMAND",
+    "sub-command", "Sub-Command", "SUB-COMMAND",
+    "sub-commands", "Sub-Commands", "SUB-COMMANDS",
+)
 
 def _is_usage_keyword(s: str) -> bool:
     """ Check if a line starts with 'Usage', 'USAGE' or 'usage'. """
-    is_usage = False
-    if s.startswith("Usage"):
-        is_usage = True
-    elif s.startswith("usage"):
-        is_usage = True
-    elif s.startswith("USAGE"):
-        is_usage = True
-    return is_usage
+    return s.startswith(_USAGE_KEYWORDS)
 
 def _is_command_keyword(s: str) -> int:
     """
     Check if a line starts with the command keyword.
     Returns the size of the keyword or 0 if not found.
     """
-    if s.startswith("Command"):
-        return len("Command")
-    elif s.startswith("command"):
-        return len("command")
-    elif s.startswith("COMMAND"):
-        return len("COMMAND")
-    elif s.startswith("Commands"):
-        return len("Commands")
-    elif s.startswith("commands"):
-        return len("commands")
-    elif s.startswith("COMMANDS"):
-        return len("COMMANDS")
-    elif s.startswith("Subcommands"):
-        return len("Subcommands")
-    elif s.startswith("subcommands"):
-        return len("subcommands")
-    elif s.startswith("SUBCOMMANDS"):
-        return len("SUBCOMMANDS")
-    elif s.startswith("Subcommand"):
-        return len("Subcommand")
-    elif s.startswith("subcommand"):
-        return len("subcommand")
-    elif s.startswith("SUBCOMMAND"):
-        return len("SUBCOMMAND")
-    elif s.startswith("sub-command"):
-        return len("sub-command")
-    elif s.startswith("Sub-Command"):
-        return len("Sub-Command")
-    elif s.startswith("SUB-COMMAND"):
-        return len("SUB-COMMAND")
-    elif s.startswith("sub-commands"):
-        return len("sub-commands")
-    elif s.startswith("Sub-Commands"):
-        return len("Sub-Commands")
-    elif s.startswith("SUB-COMMANDS"):
-        return len("SUB-COMMANDS")
+    if not s.startswith(_COMMAND_KEYWORDS):
+        return 0
+    for keyword in _COMMAND_KEYWORDS:
+        if s.startswith(keyword):
+            return len(keyword)
     return 0
 
+# Accepted indent prefixes per indent level, (half indent, tab indent).
+# A full 4 space indent always starts with the 2 space half indent, so it needs
+# no prefix of its own.
+_INDENT_PREFIXES = tuple((' ' * (2 * level), '\t' * level) for level in range(4))
+
+# Indents of argument description lines following an argument, see `parse_argument`.
+_ARG_DESC_INDENTS = ("        ", "\t\t")
+
 def _is_indented_line(s: str, indent_level: int = 1) -> bool:
     """ Check if a line starts with the specified indent level (4 spaces or a tab). """
-    if not s.strip():
+    if _is_blank_line(s):
         return False
 
     if indent_level < 1:
         # make sure the line has no leading spaces or tabs
-        if s.startswith(' ') or s.startswith('\t'):
-            return False
-        else :
-            return True
-    half_indent = ' ' * (2 * indent_level)
-    space_indent = ' ' * (4 * indent_level)
-    tab_indent = '\t' * indent_level
-    return s.startswith(space_indent) or s.startswith(tab_indent) or s.startswith(half_indent)
+        return not s.startswith((' ', '\t'))
+    if indent_level < len(_INDENT_PREFIXES):
+        return s.startswith(_INDENT_PREFIXES[indent_level])
+    return s.startswith((' ' * (2 * indent_level), '\t' * indent_level))
+
+def _is_blank_line(s: str) -> bool:
+    """ Check if a line is empty or whitespace only, without allocating a stripped copy. """
+    return not s or s.isspace()
 
 def _is_whitespace(c: str) -> bool:
     """ Check if a character is a whitespace or tab. """
-    return c == ' ' or c == '\t'
+    return c in _WHITESPACE_CHARS
 
 def _skip_chars(s: str, pos: int, char: str, count: int = 1) -> int:
     """ Skip the specified character from the given position in the string.
@@ -125,7 +118,7 @@ def _skip_whitespace(s: str, pos: int = 0) -> int:
     """ Count the number of concecutive whitespaces(or tabs) in a `str`, starting from `pos`.
     """
     beg = pos
-    while beg < len(s) and (s[beg] in (' ', '\t')):
+    while beg < len(s) and s[beg] in _WHITESPACE_CHARS:
         beg += 1
     return beg - pos
 
@@ -135,33 +128,67 @@ def _line_startswith(s: str, prefix: str, pos : int = 0) -> bool:
 
 def _in_line(pos: int, s: str) -> bool:
     """ Check if the position is within the line bounds. """
-    return pos >= 0 and pos < len(s)
+    return 0 <= pos < len(s)
 
 def _in_range(line: int, inp: List[str]) -> bool:
     """ Check if the line and column are within the input bounds. """
-    return line >= 0 and line < len(inp)
+    return 0 <= line < len(inp)
+
+# Line classification flags, see `_classify_lines`.
+_LINE_BLANK = 1     # Empty or whitespace only line.
+_LINE_INDENT = 2    # Non-empty line indented by at least one level.
+_LINE_USAGE = 4     # Line starts with a usage keyword.
+_LINE_COMMAND = 8   # Line starts with a command keyword.
+
+def _classify_lines(inp: List[str]) -> bytearray:
+    """ Classify each input line once, so the top level parse loop can test
+        flags instead of re-scanning the same line.
+        - Returns one byte of `_LINE_*` flags per line.
+    """
+    kinds = bytearray(len(inp))
+    for idx, s in enumerate(inp):
+        if _is_blank_line(s):
+            kinds[idx] = _LINE_BLANK
+            continue
+        kind = 0
+        if _is_indented_line(s,1):
+            kind |= _LINE_INDENT
+        if _is_usage_keyword(s):
+            kind |= _LINE_USAGE
+        if _is_command_keyword(s) != 0:
+            kind |= _LINE_COMMAND
+        kinds[idx] = kind
+    return kinds
+
+def _next_content_lines(kinds: bytearray) -> List[int]:
+    """ For each line index, get the index of the first non-blank line at or
+        after it, or `len(kinds)` if only blank lines follow.
+        - Has one extra trailing entry, so any line index up to `len(kinds)` is valid.
+    """
+    nxt = [len(kinds)] * (len(kinds) + 1)
+    after = len(kinds)
+    for idx in range(len(kinds) - 1, -1, -1):
+        if not kinds[idx] & _LINE_BLANK:
+            after = idx
+        nxt[idx] = after
+    return nxt
 
 ###############################################################################
 # Parsing Automatons
 # - Each parse function approximatley models a grammar rule from the CMNH EBNF.
-# - Success -> tuple[Ast,int,int] -> (ast, end_line, end_col)
-# - Failure -> tuple[str,int,int,List[str]]] -> (error message, line, col, input)
+# - Success -> `_ok(ast, end_line, end_col)`
+# - Failure -> `_err(error message, line, col, input)`
 ###############################################################################
 
-class ParseResult:
-    """ Result of a parse operation. """
-    def __init__(self, res: Union[tuple[Ast,int,int],tuple[str,int,int,List[str]]]) -> None:
-        if isinstance(res, tuple):
-            self.ast = res[0]
-            self.end_line = res[1]
-            self.end_col = res[2]
-            self.error = None
-        else:
-            self.ast = None
-            self.error = res[0]
-            self.end_line = res[1]
-            self.end_col = res[2]
-            self.source = res[3] if len(res) > 3 else None
+class ParseResult(NamedTuple):
+    """ Result of a parse operation.
+        - Build with `_ok` on success or `_err` on failure.
+    """
+    ast: Optional[Ast]
+    end_line: int
+    end_col: int
+    error: Optional[str] = None
+    source: Union[List[str],str,None] = None
 
     def is_error(self) -> bool:
         """ Check if the parse result is an error. """
@@ -183,6 +210,14 @@ class ParseResult:
         """ Get the column number where the parse ended. """
         return self.end_col
 
+def _ok(node: Ast, line: int, col: int) -> ParseResult:
+    """ Successful parse of `node`, ending at `line`,`col`. """
+    return ParseResult(node,line,col)
+
+def _err(error: str, line: int, col: int, source: Union[List[str],str,None] = None) -> ParseResult:
+    """ Failed parse with an `error` message, at `line`,`col` of `source`. """
+    return ParseResult(None,line,col,error,source)
+
 def parse_long_flag(inp : List[str], line: int, col: int) -> ParseResult:
     """
     EBNF:
@@ -197,25 +232,24 @@ def parse_long_flag(inp : List[str], line: int, col: int) -> ParseResult:
     beg_line = line
     beg_col = col
     if not _in_line(col,inp[line]):
-        return ParseResult(("Expected long flag but reached end of input.",line,col,inp))
+        return _err("Expected long flag but reached end of input.",line,col,inp)
     col += _skip_whitespace(inp[line],col)
     if not inp[line].startswith('--',col):
-        return ParseResult(("Expected long flag starting with a '--'.",line,col,inp))
+        return _err("Expected long flag starting with a '--'.",line,col,inp)
     col += 2
     flag_beg_line = line
     flag_beg_col = col
-    flag_ident = ""
-    while _in_line(col,inp[line]) and _is_alnumdash(inp[line][col]):
-        flag_ident += inp[line][col]
+    while _in_line(col,inp[line]) and inp[line][col] in _ALNUMDASH_CHARS:
         col += 1
+    flag_ident = inp[line][flag_beg_col:col]
     if len(flag_ident) < 2 or not _is_alpha(flag_ident[0]) or not _is_alnumus(flag_ident[-1]):
-        return ParseResult(("Invalid long flag identifier.",line,col,inp))
+        return _err("Invalid long flag identifier.",line,col,inp)
     if _in_line(col,inp[line]) and not (_is_whitespace(inp[line][col]) or inp[line][col] == ','):
-        return ParseResult(("Expected whitespace or comma after long flag.",line,col,inp))
-    return ParseResult((Ast(Tk.LONG_FLAG,None,beg_line,beg_col,line,col,\
-                            [Ast(Tk.LONG_FLAG_IDENT,flag_ident,flag_beg_line,flag_beg_col,line,col)]),
-                        line,
-                        col))
+        return _err("Expected whitespace or comma after long flag.",line,col,inp)
+    return _ok(Ast(Tk.LONG_FLAG,None,beg_line,beg_col,line,col,\
+                   [Ast(Tk.LONG_FLAG_IDENT,sys.intern(flag_ident),flag_beg_line,flag_beg_col,line,col)]),
+               line,
+               col)
 
 def parse_short_flag(inp : List[str], line: int, col: int) -> ParseResult:
     """
@@ -225,22 +259,22 @@ def parse_short_flag(inp : List[str], line: int, col: int) -> ParseResult:
     beg_line = line
     beg_col = col
     if not _in_line(col,inp[line]):
-        return ParseResult(("Expected short flag but reached end of inp.",line,col,inp))
+        return _err("Expected short flag but reached end of inp.",line,col,inp)
     if not inp[line].startswith('-',col) or inp[line].startswith('--',col):
-        return ParseResult(("Expected short flag starting with a '-'.",line,col,inp))
+        return _err("Expected short flag starting with a '-'.",line,col,inp)
     col += 1
     if not _in_line(col,inp[line]) or not _is_alpha(inp[line][col]):
-        return ParseResult(("Invalid short flag identifier.",line,col,inp))
+        return _err("Invalid short flag identifier.",line,col,inp)
     flag_beg_line = line
     flag_beg_col = col
     flag_ident = inp[line][col]
     col += 1
     if _in_line(col,inp[line]) and not (_is_whitespace(inp[line][col]) or inp[line][col] == ','):
-        return ParseResult(("Expected whitespace or comma after short flag.",line,col,inp))
-    return ParseResult((Ast(Tk.SHORT_FLAG,None,beg_line,beg_col,line,col,\
-                            [Ast(Tk.SHORT_FLAG_IDENT,flag_ident,flag_beg_line,flag_beg_col,line,col)])
-                        ,line
-                        ,col))
+        return _err("Expected whitespace or comma after short flag.",line,col,inp)
+    return _ok(Ast(Tk.SHORT_FLAG,None,beg_line,beg_col,line,col,\
+                   [Ast(Tk.SHORT_FLAG_IDENT,flag_ident,flag_beg_line,flag_beg_col,line,col)])
+               ,line
+               ,col)
 
 def parse_optional_arg(inp : List[str], line: int, col: int) -> ParseResult:
     """
@@ -255,27 +289,27 @@ def parse_optional_arg(inp : List[str], line: int, col: int) -> ParseResult:
     beg_line = line
     beg_col = col
     if not _in_range(line,inp):
-        return ParseResult(("Expected optional argument but reached end of input.",line,col,inp))
+        return _err("Expected optional argument but reached end of input.",line,col,inp)
     col += _skip_whitespace(inp[line],col)
     if not inp[line].startswith('[',col):
-        return ParseResult(("Expected optional argument starting with a '['.",line,col,inp))
+        return _err("Expected optional argument starting with a '['.",line,col,inp)
     col += 1
     ident_beg_line = line
     ident_beg_col = col
-    arg_ident = ""
-    while _in_line(col,inp[line]) and inp[line][col] != ']':
-        arg_ident += inp[line][col]
-        col += 1
+    # Scan to the closing ']' in one call, or to the end of the line if missing.
+    closing_col = inp[line].find(']',col)
+    col = closing_col if closing_col != -1 else max(col,len(inp[line]))
+    arg_ident = inp[line][ident_beg_col:col]
     if len(arg_ident) < 1:
-        return ParseResult(("Expected optional argument identifier.",line,col,inp))
+        return _err("Expected optional argument identifier.",line,col,inp)
     col += _skip_whitespace(inp[line],col)
     if not _in_line(col,inp[line]) or not inp[line].startswith(']',col):
-        return ParseResult(("Expected closing ']' for optional argument.",line,col,inp))
+        return _err("Expected closing ']' for optional argument.",line,col,inp)
     col += 1
-    return ParseResult((Ast(Tk.OPTIONAL_ARG,None,beg_line,beg_col,line,col,\
-                            [Ast(Tk.SHELL_IDENT,arg_ident,ident_beg_line,ident_beg_col,line,col)])
-                        ,line
-                        ,col))
+    return _ok(Ast(Tk.OPTIONAL_ARG,None,beg_line,beg_col,line,col,\
+                   [Ast(Tk.SHELL_IDENT,sys.intern(arg_ident),ident_beg_line,ident_beg_col,line,col)])
+               ,line
+               ,col)
 
 def parse_required_arg(inp : List[str], line: int, col: int) -> ParseResult:
     """
@@ -286,27 +320,27 @@ def parse_required_arg(inp : List[str], line: int, col: int) -> ParseResult:
     beg_line = line
     beg_col = col
     if not _in_range(line,inp):
-        return ParseResult(("Expected required argument but reached end of input.",line,col,inp))
+        return _err("Expected required argument but reached end of input.",line,col,inp)
     col += _skip_whitespace(inp[line],col)
     if not inp[line].startswith('<',col):
-        return ParseResult(("Expected required argument starting with a '<'.",line,col,inp[line]))
+        return _err("Expected required argument starting with a '<'.",line,col,inp[line])
     col += 1
     ident_beg_line = line
     ident_beg_col = col
-    arg_ident = ""
-    while _in_line(col,inp[line]) and inp[line][col] != '>':
-        arg_ident += inp[line][col]
-        col += 1
+    # Scan to the closing '>' in one call, or to the end of the line if missing.
+    closing_col = inp[line].find('>',col)
+    col = closing_col if closing_col != -1 else max(col,len(inp[line]))
+    arg_ident = inp[line][ident_beg_col:col]
     if len(arg_ident) < 1 or not _is_alpha(arg_ident[0]) or not _is_alnumus(arg_ident[-1]):
-        return ParseResult(("Expected required argument identifier.",line,col,inp[line]))
+        return _err("Expected required argument identifier.",line,col,inp[line])
     col += _skip_whitespace(inp[line],col)
     if not _in_line(col,inp[line]) or not inp[line].startswith('>',col):
-        return ParseResult(("Expected closing '>' for required argument.",line,col,inp[line]))
+        return _err("Expected closing '>' for required argument.",line,col,inp[line])
     col += 1
-    return ParseResult((Ast(Tk.REQUIRED_ARG,None,beg_line,beg_col,line,col,\
-                            [Ast(Tk.SHELL_IDENT,arg_ident,ident_beg_line,ident_beg_col,line,col)])
-                        ,line
-                        ,col))
+    return _ok(Ast(Tk.REQUIRED_ARG,None,beg_line,beg_col,line,col,\
+                   [Ast(Tk.SHELL_IDENT,sys.intern(arg_ident),ident_beg_line,ident_beg_col,line,col)])
+               ,line
+               ,col)
 
 def parse_argument(inp : List[str], line: int, pos: int) -> ParseResult:
     """
@@ -315,7 +349,7 @@ def parse_argument(inp : List[str], line: int, pos: int) -> ParseResult:
         ( <optional_arg> |  <required_arg> )? <indented_line> ": " <text_line>`
     """
     if not _in_range(line,inp):
-        return ParseResult(("Expected argument but reached end of input.",line,pos,inp))
+        return _err("Expected argument but reached end of input.",line,pos,inp)
     node = Ast(Tk.ARGUMENT) # Argument root node
     has_short_flag = False          # Whether a short flag was parsed
     has_long_flag = False           # Whether a long flag was parsed
@@ -327,7 +361,7 @@ def parse_argument(inp : List[str], line: int, pos: int) -> ParseResult:
         short_flag_result = parse_short_flag(inp,line,pos)
         if short_flag_result.is_error():
             return short_flag_result
-        node.append(short_flag_result.get_ast())
+        node.branches.append(short_flag_result.get_ast())
         line = short_flag_result.get_line()
         pos = short_flag_result.get_col()
         pos += _skip_whitespace(inp[line],pos)
@@ -342,7 +376,7 @@ def parse_argument(inp : List[str], line: int, pos: int) -> ParseResult:
         long_flag_result = parse_long_flag(inp,line,pos)
         if long_flag_result.is_error():
             return long_flag_result
-        node.append(long_flag_result.get_ast())
+        node.branches.append(long_flag_result.get_ast())
         line = long_flag_result.get_line()
         pos = long_flag_result.get_col()
         pos += _skip_whitespace(inp[line],pos)
@@ -352,28 +386,28 @@ def parse_argument(inp : List[str], line: int, pos: int) -> ParseResult:
 
     # Require atleast one flag
     if not has_long_flag and not has_short_flag:
-        return ParseResult(f"Expected at least one long flag at line {line}")
+        return _err(f"Expected at least one long flag at line {line}",line,pos)
 
     # Parse optional or required argument
     if inp[line].startswith('[',pos):
         optional_arg_result = parse_optional_arg(inp,line,pos)
         if optional_arg_result.is_error():
             return optional_arg_result
-        node.append(optional_arg_result.get_ast())
+        node.branches.append(optional_arg_result.get_ast())
         line = optional_arg_result.get_line()
         pos = optional_arg_result.get_col()
         if line >= len(inp):
-            return ParseResult(("Expected argument description but reached end of input.",line,pos,inp))
+            return _err("Expected argument description but reached end of input.",line,pos,inp)
         pos += _skip_whitespace(inp[line],pos)
     elif inp[line].startswith('<',pos):
         required_arg_result = parse_required_arg(inp,line,pos)
         if required_arg_result.is_error():
             return required_arg_result
-        node.append(required_arg_result.get_ast())
+        node.branches.append(required_arg_result.get_ast())
         line = required_arg_result.get_line()
         pos = required_arg_result.get_col()
         if line >= len(inp):
-            return ParseResult(("Expected argument description but reached end of input.",line,pos,inp))
+            return _err("Expected argument description but reached end of input.",line,pos,inp)
 
         pos += _skip_whitespace(inp[line],pos)
 
@@ -384,9 +418,9 @@ def parse_argument(inp : List[str], line: int, pos: int) -> ParseResult:
         pos += _skip_whitespace(inp[line],pos)
         text = inp[line][pos:].strip()
         if text == "":
-            return ParseResult(("Expected argument description text after ':'.",line,pos,inp))
-        node.append(Ast(Tk.TEXT_LINE,text))
-        return ParseResult((node,line,0))
+            return _err("Expected argument description text after ':'.",line,pos,inp)
+        node.branches.append(Ast(Tk.TEXT_LINE,text))
+        return _ok(node,line,0)
     else:
         text = inp[line][pos:].strip()
         if text == "":
@@ -400,22 +434,22 @@ def parse_argument(inp : List[str], line: int, pos: int) -> ParseResult:
                 #line += 1
 
                 if not text == "":
-                    node.append(Ast(Tk.TEXT_LINE,text))
+                    node.branches.append(Ast(Tk.TEXT_LINE,text))
                     line += 1
 
                 while line < len(inp)\
-                        and (inp[line].startswith("        ") or inp[line].startswith("\t\t")):
+                        and inp[line].startswith(_ARG_DESC_INDENTS):
                     text = inp[line].strip()
                     line += 1
-                    node.append(Ast(Tk.TEXT_LINE,text))
+                    node.branches.append(Ast(Tk.TEXT_LINE,text))
             else:
                 line += 1
-                return ParseResult((node,line,pos)) # No desc, continue
+                return _ok(node,line,pos) # No desc, continue
         else :
-            node.append(Ast(Tk.TEXT_LINE,text))
+            node.branches.append(Ast(Tk.TEXT_LINE,text))
             line += 1
 
-    return ParseResult((node,line,pos))
+    return _ok(node,line,pos)
 
 def parse_argument_list(inp : List[str], line: int, pos: int) -> ParseResult:
     """
@@ -427,82 +461,85 @@ def parse_argument_list(inp : List[str], line: int, pos: int) -> ParseResult:
         arg_result = parse_argument(inp,line,pos)
         if arg_result.is_error():
             return arg_result
-        node.append(arg_result.get_ast())
+        node.branches.append(arg_result.get_ast())
         line = arg_result.get_line()
         pos = 0 # Reset the column position for the newline. Assuming each argument starts on a new line.
         # Skip any empty lines between arguments.
-        while line < len(inp) and inp[line].strip() == "":
+        while line < len(inp) and _is_blank_line(inp[line]):
             line += 1
 
     # Programmer error, you should detect an argument dash before calling this function.
     if len(node.branches) == 0:
-        return ParseResult(("Attempting to parse non-existing argument list.",line,pos,inp))
-    return ParseResult((node,line,pos))
+        return _err("Attempting to parse non-existing argument list.",line,pos,inp)
+    return _ok(node,line,pos)
 
 def parse_section(inp : List[str], line: int, pos: int) -> ParseResult:
     """
     EBNF:
         `<section> ::= <text_line> "\\n" <indented_line> ( <argument_list> | <paragraph> )`
     """
-    if line > len(inp):
-        return ParseResult(("Expected section but reached end of input.",line,pos,inp))
+    if line >= len(inp):
+        return _err("Expected section but reached end of input.",line,pos,inp)
     if _is_indented_line(inp[line]):
-        return ParseResult(("Expected section title.",line,pos,inp))
+        return _err("Expected section title.",line,pos,inp)
     section_title = inp[line].strip()
     line += 1
     section = Ast(Tk.SECTION,section_title)
     if not line < len(inp) or not _is_indented_line(inp[line]):
-        return ParseResult(("Expected indented text after section title.",line,pos,inp))
+        return _err("Expected indented text after section title.",line,pos,inp)
 
     section_start = _skip_whitespace(inp[line])
     if inp[line].startswith('-',section_start):
         arg_list_result = parse_argument_list(inp,line,section_start)
         if arg_list_result.is_error():
-            return ParseResult(("Failed to parse argument list.",line,pos,inp))
+            return _err("Failed to parse argument list.",line,pos,inp)
         section.append(arg_list_result.get_ast())
-        return ParseResult((section,arg_list_result.get_line(),arg_list_result.get_col()))
+        return _ok(section,arg_list_result.get_line(),arg_list_result.get_col())
     else:
         para_result = parse_paragraph(inp,line,0,1)
         if para_result.is_error():
-            return ParseResult(("Failed to parse paragraph.",line,pos,inp))
+            return _err("Failed to parse paragraph.",line,pos,inp)
         section.append(para_result.get_ast())
         line = para_result.get_line()
         pos = para_result.get_col()
-        return ParseResult((section,line,pos))
+        return _ok(section,line,pos)
 
-def parse_paragraph(inp : List[str], line: int, pos: int,indent_level = 0) -> ParseResult:
+def parse_paragraph(inp : List[str], line: int, pos: int,indent_level: int = 0) -> ParseResult:
     """ A paragraph is one or more indented text lines. """
         # Skip any empty lines beforehand
-    if inp[line].strip() == "":
+    if _is_blank_line(inp[line]):
         line += 1
     if line >= len(inp):
-        return ParseResult(("Expected paragraph but reached end of input.",line,pos,inp))
+        return _err("Expected paragraph but reached end of input.",line,pos,inp)
     if not _is_indented_line(inp[line],indent_level):
-        return ParseResult(("Expected indented paragraph.",line,pos,inp))
+        return _err("Expected indented paragraph.",line,pos,inp)
     para = Ast(Tk.PARAGRAPH)
-    while line < len(inp) and                                                  \
-        ( _is_indented_line(inp[line],indent_level) or inp[line].strip() == "" ):
+    while line < len(inp):
+        # Strip each line once, an empty text is a blank line.
+        text = inp[line].strip()
+        if text != "" and not _is_indented_line(inp[line],indent_level):
+            break
         # When indent level is 0, disambiguate from a section title by looking
         # forward for an indented line.
-        if indent_level == 0                                                   \
-            and not _is_indented_line(inp[line],1) and inp[line].strip() != ""  \
+        if indent_level == 0 and text != ""                                    \
+            and not _is_indented_line(inp[line],1)                             \
             and line + 1 < len(inp) and _is_indented_line(inp[line + 1],1):
             break
-        para.append(Ast(Tk.TEXT_LINE,inp[line].strip()))
+        para.append(Ast(Tk.TEXT_LINE,text))
         line += 1
 
     # while the last line is empty, move back to the last non-empty line
     while len(para.branches) > 0 and para.branches[-1].value == "":
         para.branches.pop()
 
-    return ParseResult((para,line,0))
+    return _ok(para,line,0)
 
 def parse_usage_section(inp : List[str], line: int, pos: int) -> ParseResult:
     """ A usage section starts with 'Usage:' or 'usage:' or 'USAGE:' """
     if line >= len(inp):
-        return ParseResult("Expected usage section but reached end of inp")
+        return _err("Expected usage section but reached end of inp",line,pos)
     if not _is_usage_keyword(inp[line]):
-        return ParseResult(("Expected usage section starting with 'Usage:'.",line,pos,inp))
+        return _err("Expected usage section starting with 'Usage:'.",line,pos,inp)
     pos += len("Usage")
     pos += _skip_whitespace(inp[line],pos)
     pos += _skip_chars(inp[line],pos,':',1)
@@ -515,11 +552,13 @@ def parse_usage_section(inp : List[str], line: int, pos: int) -> ParseResult:
             usage_text = inp[line].strip()
             line += 1
         else:
-            return ParseResult(("Expected indented usage text after usage keyword.",line,pos,inp))
+            return _err("Expected indented usage text after usage keyword.",line,pos,inp)
 
-        while line < len(inp) and (_is_indented_line(inp[line],1) \
-              or inp[line].strip() == ""):
-            usage_text += "\n" + inp[line].strip()
+        while line < len(inp):
+            text = inp[line].strip()
+            if text != "" and not _is_indented_line(inp[line],1):
+                break
+            usage_text += "\n" + text
             line += 1
         # Delete any following empty lines
         while usage_text[-1] == " " or usage_text[-1] == '\t' \
@@ -532,21 +571,24 @@ def parse_usage_section(inp : List[str], line: int, pos: int) -> ParseResult:
             or usage_text[-1] == '\n':
             usage_text = usage_text[0:len(usage_text)-1]
         pos = 0  # reset pos for next line, always end at start of next line
-    return ParseResult((Ast(Tk.USAGE,usage_text),line,pos))
+    return _ok(Ast(Tk.USAGE,usage_text),line,pos)
 
 def parse_command_section(inp : List[str], line: int, pos: int) -> ParseResult:
+    """ A command section starts with a command keyword, followed by an
+        indented list of commands and optionally indented sub-commands.
+    """
     if line >= len(inp):
-        return ParseResult("Expected usage section but reached end of inp")
+        return _err("Expected usage section but reached end of inp",line,pos)
     is_command_section = _is_command_keyword(inp[line])
     if is_command_section == 0:
-        return ParseResult(("Expected command section starting with command keyword.",line,pos,inp))
+        return _err("Expected command section starting with command keyword.",line,pos,inp)
     pos += is_command_section
     pos += _skip_whitespace(inp[line],pos)
     pos += _skip_chars(inp[line],pos,':',1)
     pos += _skip_whitespace(inp[line],pos)
     # Must be followed by indented list of commands
     if line + 1 >= len(inp) or not _is_indented_line(inp[line + 1],1):
-        return ParseResult(("Expected indented command list after command keyword.",line,pos,inp))
+        return _err("Expected indented command list after command keyword.",line,pos,inp)
     line += 1
     pos = 0
     cmd_section = Ast(Tk.COMMAND_SECTION)
@@ -560,14 +602,14 @@ def parse_command_section(inp : List[str], line: int, pos: int) -> ParseResult:
         cmd_name = cmd_parts[0]
         cmd_desc = cmd_parts[1].strip() if len(cmd_parts) > 1 else ""
         if cmd_name == "":
-            return ParseResult(("Expected command name.",line,pos,inp))
+            return _err("Expected command name.",line,pos,inp)
         cmd_node = Ast(Tk.COMMAND,cmd_name)
         if cmd_desc != "":
             cmd_node.append(Ast(Tk.TEXT_LINE,cmd_desc))
         line += 1
         pos = 0
         # skip any empty lines after command
-        while line < len(inp) and inp[line].strip() == "":
+        while line < len(inp) and _is_blank_line(inp[line]):
             line += 1
 
         # Check for a following indented line, indicating a sub-command.
@@ -580,7 +622,7 @@ def parse_command_section(inp : List[str], line: int, pos: int) -> ParseResult:
             sub_cmd_name = sub_cmd_parts[0]
             sub_cmd_desc = sub_cmd_parts[1].strip() if len(sub_cmd_parts) > 1 else ""
             if sub_cmd_name == "":
-                return ParseResult(("Expected sub-command name.",line,pos,inp))
+                return _err("Expected sub-command name.",line,pos,inp)
             sub_cmd_node = Ast(Tk.COMMAND,sub_cmd_name)
             if sub_cmd_desc != "":
                 sub_cmd_node.append(Ast(Tk.TEXT_LINE,sub_cmd_desc))
@@ -588,14 +630,14 @@ def parse_command_section(inp : List[str], line: int, pos: int) -> ParseResult:
             line += 1
             pos = 0
             # skip any empty lines after sub-command
-            while line < len(inp) and inp[line].strip() == "":
+            while line < len(inp) and _is_blank_line(inp[line]):
                 line += 1
 
         cmd_section.append(cmd_node)
 
     if len(cmd_section.branches) == 0:
-        return ParseResult(("Expected at least one command in command section.",line,pos,inp))
-    return ParseResult((cmd_section,line,pos))
+        return _err("Expected at least one command in command section.",line,pos,inp)
+    return _ok(cmd_section,line,pos)
 
 def parse_help_text(inp : List[str], line: int, pos: int) -> ParseResult:
     """
@@ -609,22 +651,20 @@ def parse_help_text(inp : List[str], line: int, pos: int) -> ParseResult:
     line = 0
 
     if inp == []:
-        return ParseResult(("Input is empty",line,pos,inp))
+        return _err("Input is empty",line,pos,inp)
 
+    kinds = _classify_lines(inp)
+    next_content = _next_content_lines(kinds)
     while line < len(inp):
         pos = 0
 
-        if inp[line].strip() == "": # Skip empty lines
-            line += 1
+        if kinds[line] & _LINE_BLANK: # Skip empty lines
+            line = next_content[line]
             continue
-        is_usage = False
         is_section = False
-        sect_title = inp[line]
 
         # Check for special case usage section which does not require a following indent.
-        is_usage = False
-        if _is_usage_keyword(sect_title):
-            is_usage = True
+        if kinds[line] & _LINE_USAGE:
             usage_result = parse_usage_section(inp,line,pos)
             if usage_result.is_error():
                 return usage_result
@@ -632,14 +672,11 @@ def parse_help_text(inp : List[str], line: int, pos: int) -> ParseResult:
             line = usage_result.get_line()
             pos = usage_result.get_col()
             # skip any empty lines after usage
-            while line < len(inp) and inp[line].strip() == "":
-                line += 1
+            line = next_content[min(line,len(inp))]
             continue
 
         # Check for special case command section. Requires a following indent.
-        is_command = _is_command_keyword(sect_title)
-        if is_command != 0:
-            is_command = True
+        if kinds[line] & _LINE_COMMAND:
             command_result = parse_command_section(inp,line,pos)
             if command_result.is_error():
                 return command_result
@@ -647,16 +684,13 @@ def parse_help_text(inp : List[str], line: int, pos: int) -> ParseResult:
             line = command_result.get_line()
             pos = command_result.get_col()
             # skip any empty lines after command section
-            while line < len(inp) and inp[line].strip() == "":
-                line += 1
+            line = next_content[min(line,len(inp))]
             continue
 
-        # If not usage, parse regular section or paragraph
-        if not is_usage:
-            section_begin = inp[line + 1] if line + 1 < len(inp) else ""
-            if _is_indented_line(section_begin,1):
-                if section_begin.strip() != "": # next line is empty, paragraph
-                    is_section = True
+        # Parse regular section or paragraph.
+        # A section title is followed by a non-empty indented line.
+        if line + 1 < len(inp) and kinds[line + 1] & _LINE_INDENT:
+            is_section = True
 
         if is_section:
             section_result = parse_section(inp,line,pos)
@@ -665,8 +699,7 @@ def parse_help_text(inp : List[str], line: int, pos: int) -> ParseResult:
             output.append(section_result.get_ast())
             line = section_result.get_line()
             pos = section_result.get_col()
-            while line < len(inp) and inp[line].strip() == "":
-                line += 1
+            line = next_content[min(line,len(inp))]
         else:
             para_result = parse_paragraph(inp,line,pos)
             if para_result.is_error():
@@ -674,9 +707,8 @@ def parse_help_text(inp : List[str], line: int, pos: int) -> ParseResult:
             output.append(para_result.get_ast())
             line = para_result.get_line()
             pos = para_result.get_col()
-            while line < len(inp) and inp[line].strip() == "":
-                line += 1
-    return ParseResult((output,line,pos))
+            line = next_content[min(line,len(inp))]
+    return _ok(output,line,pos)
 
 ###############################################################################
 # Parser
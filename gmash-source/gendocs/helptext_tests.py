@@ -13,128 +13,108 @@ Copyright(c) 2025 Anton Yashchenko
 #-----------------------------------------------------------------------------#
 """
 
-from helptext_common import print_error,print_action
+import contextlib
+import functools
+import io
+import os
+import sys
+import tempfile
+from typing import Callable, Iterator, List, Optional, Tuple
+from helptext_common import print_error,print_action,COLOR_RED,COLOR_GREEN,COLOR_RESET
 from helptext_ast import Ast,Tk
-from helptext_parser import parse
+from helptext_parser import parse, ParseResult
 from helptext_parser import                                     \
     parse_long_flag,parse_short_flag,parse_argument,            \
     parse_optional_arg,parse_required_arg,parse_argument_list,  \
     parse_section,parse_usage_section,parse_help_text
 from helptext_md import generate_md
+from helptext import HelpText
 ###############################################################################
 # Unit Test Utils
 ###############################################################################
 
-def _print_ast_diff(input_ast : Ast, expected_ast : Ast, indent: int = 0, path: tuple = ()) -> None:
-    """Compare and print two ASTs with differences highlighted"""
-    indent_str = "    " * indent
-    connector = "└── " if indent > 0 else ""
-
-    # Find corresponding node in expected AST
-    expected_node = expected_ast
-    for idx in path:
-        if idx < len(expected_node.branches):
-            expected_node = expected_node.branches[idx]
-        else:
-            expected_node = None
-            break
-
-    # Determine if nodes are different
-    is_different = (
-        expected_node is None or
-        input_ast.tk.name != expected_node.tk.name or
-        input_ast.value != expected_node.value
-    )
-
-    # Node content with color coding
-    content = input_ast.tk.name + ': ' + input_ast.value if input_ast.value is not None else input_ast.tk.name
-
-    if is_different:
-        print(f"{indent_str}{connector}\033[91m{content}\033[0m")  # Red for differences
-    else:
-        print(f"{indent_str}{connector}{content}")  # Default color for matches
+def _format_diff_node(node : Ast, depth : int, is_different : bool, color : str) -> List[str]:
+    """ Format a single diff tree node, colored if it differs from its counterpart. """
+    indent_str = "    " * depth
+    connector = "└── " if depth > 0 else ""
+    content = node.tk.name + ': ' + node.value if node.value is not None else node.tk.name
+    # Pick the color escapes once, matching nodes are printed without any.
+    color_beg, color_end = (color, COLOR_RESET) if is_different else ("", "")
+    lines = [f"{indent_str}{connector}{color_beg}{content}{color_end}"]
 
     # Print position info (optional)
-    if input_ast.line > 0:
-        pos_info = f"[L{input_ast.line}:{input_ast.col}-L{input_ast.end_line}:{input_ast.end_col}]"
-        if is_different:
-            print(f"{indent_str}    \033[91m{pos_info}\033[0m")
-        else:
-            print(f"{indent_str}    {pos_info}")
-
-    # Recursively print children
-    for i, child in enumerate(input_ast.branches):
-        _print_ast_diff(child, expected_ast, indent + 1, path + (i,))
-
-def _print_expected_ast_diff(expected_ast : Ast, input_ast : Ast, indent: int = 0, path: tuple = ()) -> None:
-    """Print expected AST highlighting differences from input"""
-    indent_str = "    " * indent
-    connector = "└── " if indent > 0 else ""
-
-    # Find corresponding node in input AST
-    input_node = input_ast
-    for idx in path:
-        if idx < len(input_node.branches):
-            input_node = input_node.branches[idx]
-        else:
-            input_node = None
-            break
-
-    # Determine if nodes are different
-    is_different = (
-        input_node is None or
-        expected_ast.tk.name != input_node.tk.name or
-        expected_ast.value != input_node.value
-    )
-
-    # Node content with color coding
-    content = expected_ast.tk.name + ': ' + expected_ast.value if expected_ast.value is not None else expected_ast.tk.name
-
-    if is_different:
-        print(f"{indent_str}{connector}\033[92m{content}\033[0m")  # Green for differences
-    else:
-        print(f"{indent_str}{connector}{content}")  # Default color for matches
-
-    # Print position info (optional)
-    if expected_ast.line > 0:
-        pos_info = f"[L{expected_ast.line}:{expected_ast.col}-L{expected_ast.end_line}:{expected_ast.end_col}]"
-        if is_different:
-            print(f"{indent_str}    \033[92m{pos_info}\033[0m")
-        else:
-            print(f"{indent_str}    {pos_info}")
-
-    # Recursively print children
-    for i, child in enumerate(expected_ast.branches):
-        _print_expected_ast_diff(child, input_ast, indent + 1, path + (i,))
-
-def _compare_asts(input_ast : Ast, expected_ast: Ast):
+    if node.line > 0:
+        lines.append(f"{indent_str}    {color_beg}[L{node.line}:{node.col}-L{node.end_line}:{node.end_col}]{color_end}")
+    return lines
+
+def _diff_asts(input_ast : Ast, expected_ast : Ast) -> Tuple[List[str],List[str]]:
+    """ Walk two ASTs in lockstep, producing both sides of the diff in one pass.
+        - Returns (input lines with differences in red, expected lines with differences in green).
+        - Nodes are paired by position, a node without a counterpart is a difference.
+    """
+    input_lines : List[str] = []
+    expected_lines : List[str] = []
+    stack : List[Tuple[Optional[Ast],Optional[Ast],int]] = [(input_ast, expected_ast, 0)]
+    while stack:
+        input_node, expected_node, depth = stack.pop()
+
+        # Determine if nodes are different
+        is_different = (
+            input_node is None or expected_node is None or
+            input_node.tk is not expected_node.tk or
+            input_node.value != expected_node.value
+        )
+        if input_node is not None:
+            input_lines.extend(_format_diff_node(input_node, depth, is_different, COLOR_RED))
+        if expected_node is not None:
+            expected_lines.extend(_format_diff_node(expected_node, depth, is_different, COLOR_GREEN))
+
+        # Push child pairs in reverse, so they are printed in order
+        input_branches = input_node.branches if input_node is not None else []
+        expected_branches = expected_node.branches if expected_node is not None else []
+        for i in range(max(len(input_branches), len(expected_branches)) - 1, -1, -1):
+            stack.append((input_branches[i] if i < len(input_branches) else None,
+                          expected_branches[i] if i < len(expected_branches) else None,
+                          depth + 1))
+    return input_lines, expected_lines
+
+def _compare_asts(input_ast : Ast, expected_ast: Ast) -> None:
     """Main function to compare two ASTs"""
-    print("Input AST (differences in red):")
-    _print_ast_diff(input_ast, expected_ast)
-
-    print("\nExpected AST (differences in green):")
-    _print_expected_ast_diff(expected_ast, input_ast)
-
-def _test_parser(test_name : str, parser_input : str, expected_output: Ast):
+    input_lines, expected_lines = _diff_asts(input_ast, expected_ast)
+    out = ["Input AST (differences in red):"]
+    out.extend(input_lines)
+    out.append("\nExpected AST (differences in green):")
+    out.extend(expected_lines)
+    sys.stdout.write("\n".join(out) + "\n")
+
+def _test_parser(test_name : str, parser_input : str, expected_output: Ast) -> None:
     """ Run a parser test and compare the output AST to the expected AST."""
-    ast = parse(parser_input)
-    if ast.is_error():
-        print_error(f"[FAIL] {test_name}:\n\t{ast.get_error()}",1)
+    result = parse(parser_input)
+    if result.error is not None:
+        print_error(f"[FAIL] {test_name}:\n\t{result.error}",1)
     else:
-        did_test_pass = ast.get_ast() == expected_output
+        ast = result.ast
+        did_test_pass = ast == expected_output
         if not did_test_pass:
             print_error(f"[FAIL] {test_name}. Expected ast does not match.",1)
-            _compare_asts(ast.get_ast(), expected_output)
+            _compare_asts(ast, expected_output)
         else:
             print_action(f"[PASS] {test_name}.",1)
 
-def _test_parser_function(funct,test_name : str ,parser_input : str,expected_output : Ast):
+@functools.lru_cache(maxsize=256)
+def _split_input(parser_input : str) -> List[str]:
+    """ Split a test input into lines once, repeated inputs reuse the cached list.
+        Parse functions only read input lines, so sharing the list is safe.
+    """
+    return parser_input.splitlines()
+
+def _test_parser_function(funct : Callable[[List[str],int,int],ParseResult],test_name : str ,parser_input : str,expected_output : Ast) -> None:
     """ Run a specific parser function test and compare the output AST to the expected AST."""
-    result = funct(parser_input.splitlines(),0,0)
-    if result.is_error():
+    result = funct(_split_input(parser_input),0,0)
+    if result.error is not None:
         print_error(f"[FAIL] {test_name}:\n\t{result.error}",1)
         return
-    ast = result.get_ast()
+    ast = result.ast
     did_test_pass = ast == expected_output
     if not did_test_pass:
         print_error(f"[FAIL] {test_name} failed. Expected ast does not match.",1)
@@ -142,17 +122,17 @@ def _test_parser_function(funct,test_name : str ,parser_input : str,expected_out
     else:
         print_action(f"[PASS] {test_name}.",1)
 
-def _test_generator(test_name : str, input_string : str, expected_md : str):
+def _test_generator(test_name : str, input_string : str, expected_md : str) -> None:
     """ Run a generator test and compare the output markdown to the expected markdown."""
     prs = parse(input_string)
-    if prs.is_error():
-        print_error(f"[FAIL] {test_name}:\n\t{prs.get_error()}",1)
+    if prs.error is not None:
+        print_error(f"[FAIL] {test_name}:\n\t{prs.error}",1)
         return
-    gen_res = generate_md(prs.get_ast())
-    if gen_res.is_error():
-        print_error(f"[FAIL] {test_name}:\n\t{gen_res.get_error()}",1)
+    gen_res = generate_md(prs.ast)
+    if gen_res.error is not None:
+        print_error(f"[FAIL] {test_name}:\n\t{gen_res.error}",1)
     else:
-        md = gen_res.get_md()
+        md = gen_res.md
         did_test_pass = md.strip() == expected_md.strip()
         if not did_test_pass:
             print_error(f"[FAIL] {test_name}. Expected markdown does not match.",1)
@@ -170,413 +150,531 @@ def _test_generator(test_name : str, input_string : str, expected_md : str):
         else:
             print_action(f"[PASS] {test_name}.",1)
 
+def _test_cli(test_name : str, argv : List[str], expected_files : Tuple[str,...]) -> None:
+    """ Run `HelpText.run` with the given command line args in a temporary directory.
+        - Passes if it exits cleanly, prints nothing and writes exactly the expected files.
+    """
+    real_argv = sys.argv
+    real_cwd = os.getcwd()
+    output = io.StringIO()
+    exit_code = 0
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        try:
+            sys.argv = ["helptext"] + argv
+            os.chdir(tmp_dir)
+            with contextlib.redirect_stdout(output):
+                try:
+                    HelpText().run()
+                except SystemExit as e:
+                    exit_code = e.code or 0
+            written_files = tuple(sorted(os.listdir(tmp_dir)))
+        finally:
+            sys.argv = real_argv
+            os.chdir(real_cwd)
+    if exit_code != 0 or output.getvalue() != "" or written_files != tuple(sorted(expected_files)):
+        print_error(f"[FAIL] {test_name}. Args: {argv}",1)
+        print(f"  Exit code : {exit_code}")
+        print(f"  Output    : {output.getvalue()!r}")
+        print(f"  Written   : {written_files}, expected: {tuple(sorted(expected_files))}")
+    else:
+        print_action(f"[PASS] {test_name}.",1)
+
 ###############################################################################
 # Bottom-Up Unit Tests
 ###############################################################################
 
-def ut_parsefunc_long_flag():
+# Subtrees shared by several expected trees. Expected trees are only compared,
+# never mutated, so equal subtrees are built once and shared by reference.
+_EXPECTED_LONG_FLAG_IDENT123 = Ast(Tk.LONG_FLAG,None,branches = [Ast(Tk.LONG_FLAG_IDENT,'long-flag-ident123')])
+_EXPECTED_SHORT_FLAG_F = Ast(Tk.SHORT_FLAG,None,branches = [Ast(Tk.SHORT_FLAG_IDENT,'f')])
+_EXPECTED_SHORT_FLAG_H = Ast(Tk.SHORT_FLAG,None,branches = [Ast(Tk.SHORT_FLAG_IDENT,'h')])
+_EXPECTED_OPTIONAL_ARG = Ast(Tk.OPTIONAL_ARG,None,branches = [Ast(Tk.SHELL_IDENT,'optional_arg')])
+_EXPECTED_OPTIONAL_ARG123 = Ast(Tk.OPTIONAL_ARG,None,branches = [Ast(Tk.SHELL_IDENT,'optional_arg123')])
+_EXPECTED_REQUIRED_ARG123 = Ast(Tk.REQUIRED_ARG,None,branches = [Ast(Tk.SHELL_IDENT,'required_arg123')])
+
+_EXPECTED_UT_PARSEFUNC_LONG_FLAG = _EXPECTED_LONG_FLAG_IDENT123
+
+def ut_parsefunc_long_flag() -> None:
     """ Test `parse_long_flag` function. """
     _test_parser_function(parse_long_flag,
         "ut_parsefunc_long_flag", "--long-flag-ident123",
-        Ast(Tk.LONG_FLAG,None,branches = [Ast(Tk.LONG_FLAG_IDENT,'long-flag-ident123')])
+        _EXPECTED_UT_PARSEFUNC_LONG_FLAG
     )
 
-def ut_parsefunc_short_flag():
+_EXPECTED_UT_PARSEFUNC_SHORT_FLAG = _EXPECTED_SHORT_FLAG_F
+
+def ut_parsefunc_short_flag() -> None:
     """ Test `parse_short_flag` function. """
     _test_parser_function(parse_short_flag,
         "ut_parsefunc_short_flag",
         "-f\n",
-        Ast(Tk.SHORT_FLAG,None,branches = [Ast(Tk.SHORT_FLAG_IDENT,'f')])
+        _EXPECTED_UT_PARSEFUNC_SHORT_FLAG
     )
 
-def ut_parsefunc_long_and_short_flag():
+_EXPECTED_UT_PARSEFUNC_LONG_AND_SHORT_FLAG = Ast(Tk.ARGUMENT,None,branches = [
+    _EXPECTED_SHORT_FLAG_F,
+    _EXPECTED_LONG_FLAG_IDENT123,
+    Ast(Tk.TEXT_LINE,"This is the argument documentation.")
+])
+
+def ut_parsefunc_long_and_short_flag() -> None:
     """ Test `parse_argument` with a long and short flag. """
     _test_parser_function(parse_argument,
         "ut_parsefunc_long_and_short_flag",
         "-f --long-flag-ident123 This is the argument documentation.\n",
-        Ast(Tk.ARGUMENT,None,branches = [
-            Ast(Tk.SHORT_FLAG,None,branches = [Ast(Tk.SHORT_FLAG_IDENT,'f')]),
-            Ast(Tk.LONG_FLAG,None,branches = [Ast(Tk.LONG_FLAG_IDENT,'long-flag-ident123')]),
-            Ast(Tk.TEXT_LINE,"This is the argument documentation.")
-        ])
+        _EXPECTED_UT_PARSEFUNC_LONG_AND_SHORT_FLAG
     )
 
-def ut_parsefunc_optional_arg():
+_EXPECTED_UT_PARSEFUNC_OPTIONAL_ARG = _EXPECTED_OPTIONAL_ARG123
+
+def ut_parsefunc_optional_arg() -> None:
     """ Test `parse_optional_arg` function. """
     _test_parser_function(parse_optional_arg,
         "ut_parsefunc_optional_arg",
         "[optional_arg123]",
-        Ast(Tk.OPTIONAL_ARG,None,branches = [Ast(Tk.SHELL_IDENT,'optional_arg123')])
+        _EXPECTED_UT_PARSEFUNC_OPTIONAL_ARG
     )
 
-def ut_parsefunc_required_arg():
+_EXPECTED_UT_PARSEFUNC_REQUIRED_ARG = _EXPECTED_REQUIRED_ARG123
+
+def ut_parsefunc_required_arg() -> None:
     """ Test `parse_required_arg` function. """
     _test_parser_function(parse_required_arg,
         "ut_parsefunc_required_arg",
         "<required_arg123>",
-        Ast(Tk.REQUIRED_ARG,None,branches = [Ast(Tk.SHELL_IDENT,'required_arg123')])
+        _EXPECTED_UT_PARSEFUNC_REQUIRED_ARG
     )
 
-def ut_parsefunc_argument_shortflag_only():
+_EXPECTED_UT_PARSEFUNC_ARGUMENT_SHORTFLAG_ONLY = Ast(Tk.ARGUMENT,None,branches = [
+    _EXPECTED_SHORT_FLAG_F
+])
+
+def ut_parsefunc_argument_shortflag_only() -> None:
     """ Test `parse_argument` with a short flag only. """
     _test_parser_function(parse_argument,
         "ut_parsefunc_argument_shortflag_only",
         "-f\n",
-        Ast(Tk.ARGUMENT,None,branches = [
-            Ast(Tk.SHORT_FLAG,None,branches = [Ast(Tk.SHORT_FLAG_IDENT,'f')])
-        ])
+        _EXPECTED_UT_PARSEFUNC_ARGUMENT_SHORTFLAG_ONLY
     )
 
-def ut_parsefunc_argument_longflag_only():
+_EXPECTED_UT_PARSEFUNC_ARGUMENT_LONGFLAG_ONLY = Ast(Tk.ARGUMENT,None,branches = [
+    _EXPECTED_LONG_FLAG_IDENT123
+])
+
+def ut_parsefunc_argument_longflag_only() -> None:
     """ Test `parse_argument` with a long flag only. """
     _test_parser_function(parse_argument,
         "ut_parsefunc_argument_longflag_only",
         "--long-flag-ident123\n",
-        Ast(Tk.ARGUMENT,None,branches = [
-            Ast(Tk.LONG_FLAG,None,branches = [Ast(Tk.LONG_FLAG_IDENT,'long-flag-ident123')])
-        ])
+        _EXPECTED_UT_PARSEFUNC_ARGUMENT_LONGFLAG_ONLY
     )
 
-def ut_parsefunc_argument_long_and_short_flag():
+_EXPECTED_UT_PARSEFUNC_ARGUMENT_LONG_AND_SHORT_FLAG = Ast(Tk.ARGUMENT,None,branches = [
+    _EXPECTED_SHORT_FLAG_F,
+    _EXPECTED_LONG_FLAG_IDENT123
+])
+
+def ut_parsefunc_argument_long_and_short_flag() -> None:
     """ Test `parse_argument` with both long and short flags. No documentation. """
     _test_parser_function(parse_argument,
         "ut_parsefunc_argument_long_and_short_flag",
         "-f --long-flag-ident123",
-        Ast(Tk.ARGUMENT,None,branches = [
-            Ast(Tk.SHORT_FLAG,None,branches = [Ast(Tk.SHORT_FLAG_IDENT,'f')]),
-            Ast(Tk.LONG_FLAG,None,branches = [Ast(Tk.LONG_FLAG_IDENT,'long-flag-ident123')])
-        ])
+        _EXPECTED_UT_PARSEFUNC_ARGUMENT_LONG_AND_SHORT_FLAG
     )
 
-def ut_parsefunc_argument_required_arg():
+_EXPECTED_UT_PARSEFUNC_ARGUMENT_REQUIRED_ARG = Ast(Tk.ARGUMENT,None,branches = [
+    _EXPECTED_LONG_FLAG_IDENT123,
+    _EXPECTED_REQUIRED_ARG123
+])
+
+def ut_parsefunc_argument_required_arg() -> None:
     """ Test `parse_argument` with a required arg. """
     _test_parser_function(parse_argument,
         "ut_parsefunc_argument_required_arg",
         "--long-flag-ident123 <required_arg123>",
-        Ast(Tk.ARGUMENT,None,branches = [
-            Ast(Tk.LONG_FLAG,None,branches = [Ast(Tk.LONG_FLAG_IDENT,'long-flag-ident123')]),
-            Ast(Tk.REQUIRED_ARG,None,branches = [Ast(Tk.SHELL_IDENT,'required_arg123')])
-        ])
+        _EXPECTED_UT_PARSEFUNC_ARGUMENT_REQUIRED_ARG
     )
 
-def ut_parsefunc_argument_optional_arg():
+_EXPECTED_UT_PARSEFUNC_ARGUMENT_OPTIONAL_ARG = Ast(Tk.ARGUMENT,None,branches = [
+    _EXPECTED_LONG_FLAG_IDENT123,
+    _EXPECTED_OPTIONAL_ARG123
+])
+
+def ut_parsefunc_argument_optional_arg() -> None:
     """ Test `parse_argument` with an optional arg. """
     _test_parser_function(parse_argument,
         "ut_parsefunc_argument_optional_arg",
         "--long-flag-ident123 [optional_arg123]",
-        Ast(Tk.ARGUMENT,None,branches = [
-            Ast(Tk.LONG_FLAG,None,branches = [Ast(Tk.LONG_FLAG_IDENT,'long-flag-ident123')]),
-            Ast(Tk.OPTIONAL_ARG,None,branches = [Ast(Tk.SHELL_IDENT,'optional_arg123')])
-        ])
+        _EXPECTED_UT_PARSEFUNC_ARGUMENT_OPTIONAL_ARG
     )
 
-def ut_parsefunc_argument_desc_same_line():
+_EXPECTED_UT_PARSEFUNC_ARGUMENT_DESC_SAME_LINE = Ast(Tk.ARGUMENT,None,branches = [
+    _EXPECTED_LONG_FLAG_IDENT123,
+    Ast(Tk.TEXT_LINE,"This is the argument documentation.")
+])
+
+def ut_parsefunc_argument_desc_same_line() -> None:
     """ Test `parse_argument` with description on the same line. """
     _test_parser_function(parse_argument,
         "ut_parsefunc_argument_desc_same_line",
         "--long-flag-ident123 This is the argument documentation.\n",
-        Ast(Tk.ARGUMENT,None,branches = [
-            Ast(Tk.LONG_FLAG,None,branches = [Ast(Tk.LONG_FLAG_IDENT,'long-flag-ident123')]),
-            Ast(Tk.TEXT_LINE,"This is the argument documentation.")
-        ])
+        _EXPECTED_UT_PARSEFUNC_ARGUMENT_DESC_SAME_LINE
     )
 
-def ut_parsefunc_argument_indented_brief_following_arg():
+_EXPECTED_UT_PARSEFUNC_ARGUMENT_INDENTED_BRIEF_FOLLOWING_ARG = Ast(Tk.ARGUMENT,None,branches = [
+    _EXPECTED_LONG_FLAG_IDENT123,
+    Ast(Tk.TEXT_LINE,"This is the argument documentation.")
+])
+
+def ut_parsefunc_argument_indented_brief_following_arg() -> None:
     """ Test `parse_argument` with indented description following the arg. """
     _test_parser_function(parse_argument,
         "ut_parsefunc_argument_indented_brief_following_arg",
         "--long-flag-ident123\n        This is the argument documentation.\n",
-        Ast(Tk.ARGUMENT,None,branches = [
-            Ast(Tk.LONG_FLAG,None,branches = [Ast(Tk.LONG_FLAG_IDENT,'long-flag-ident123')]),
-            Ast(Tk.TEXT_LINE,"This is the argument documentation.")
-        ])
+        _EXPECTED_UT_PARSEFUNC_ARGUMENT_INDENTED_BRIEF_FOLLOWING_ARG
     )
 
-def ut_parsefunc_argument_full():
+_EXPECTED_UT_PARSEFUNC_ARGUMENT_FULL = Ast(Tk.ARGUMENT,None,branches = [
+    _EXPECTED_SHORT_FLAG_F,
+    _EXPECTED_LONG_FLAG_IDENT123,
+    Ast(Tk.LONG_FLAG,None,branches = [Ast(Tk.LONG_FLAG_IDENT,'second-flag-opt')]),
+    _EXPECTED_OPTIONAL_ARG,
+    Ast(Tk.TEXT_LINE,"This is the argument documentation.")
+])
+
+def ut_parsefunc_argument_full() -> None:
     """ Test `parse_argument` with full features. """
     _test_parser_function(parse_argument,
         "ut_parsefunc_argument_full",
         "-f --long-flag-ident123 --second-flag-opt [optional_arg] This is the argument documentation.\n",
-        Ast(Tk.ARGUMENT,None,branches = [
-            Ast(Tk.SHORT_FLAG,None,branches = [Ast(Tk.SHORT_FLAG_IDENT,'f')]),
-            Ast(Tk.LONG_FLAG,None,branches = [Ast(Tk.LONG_FLAG_IDENT,'long-flag-ident123')]),
-            Ast(Tk.LONG_FLAG,None,branches = [Ast(Tk.LONG_FLAG_IDENT,'second-flag-opt')]),
-            Ast(Tk.OPTIONAL_ARG,None,branches = [Ast(Tk.SHELL_IDENT,'optional_arg')]),
-            Ast(Tk.TEXT_LINE,"This is the argument documentation.")
-        ])
+        _EXPECTED_UT_PARSEFUNC_ARGUMENT_FULL
     )
 
-def ut_parsefunc_argument_full_with_commas():
+_EXPECTED_UT_PARSEFUNC_ARGUMENT_FULL_WITH_COMMAS = Ast(Tk.ARGUMENT,None,branches = [
+    _EXPECTED_SHORT_FLAG_F,
+    _EXPECTED_LONG_FLAG_IDENT123,
+    Ast(Tk.LONG_FLAG,None,branches = [Ast(Tk.LONG_FLAG_IDENT,'second-flag-opt')]),
+    _EXPECTED_OPTIONAL_ARG,
+    Ast(Tk.TEXT_LINE,"This is the argument documentation.")
+])
+
+def ut_parsefunc_argument_full_with_commas() -> None:
     """ Test `parse_argument` with full features and commas. """
     _test_parser_function(parse_argument,
         "ut_parsefunc_argument_full_with_commas",
         "-f, --long-flag-ident123, --second-flag-opt [optional_arg] This is the argument documentation.\n",
-        Ast(Tk.ARGUMENT,None,branches = [
-            Ast(Tk.SHORT_FLAG,None,branches = [Ast(Tk.SHORT_FLAG_IDENT,'f')]),
-            Ast(Tk.LONG_FLAG,None,branches = [Ast(Tk.LONG_FLAG_IDENT,'long-flag-ident123')]),
-            Ast(Tk.LONG_FLAG,None,branches = [Ast(Tk.LONG_FLAG_IDENT,'second-flag-opt')]),
-            Ast(Tk.OPTIONAL_ARG,None,branches = [Ast(Tk.SHELL_IDENT,'optional_arg')]),
-            Ast(Tk.TEXT_LINE,"This is the argument documentation.")
-        ])
+        _EXPECTED_UT_PARSEFUNC_ARGUMENT_FULL_WITH_COMMAS
     )
 
-def ut_parsefunc_argument_list():
+_EXPECTED_UT_PARSEFUNC_ARGUMENT_LIST = Ast(Tk.ARGUMENT_LIST,None,branches = [
+    Ast(Tk.ARGUMENT,None,branches = [
+        _EXPECTED_SHORT_FLAG_F,
+        _EXPECTED_LONG_FLAG_IDENT123,
+        Ast(Tk.TEXT_LINE,"This is the argument documentation.")
+    ]),
+    Ast(Tk.ARGUMENT,None,branches = [
+        Ast(Tk.SHORT_FLAG,None,branches = [Ast(Tk.SHORT_FLAG_IDENT,'g')]),
+        Ast(Tk.LONG_FLAG,None,branches = [Ast(Tk.LONG_FLAG_IDENT,'another-flag')]),
+        _EXPECTED_OPTIONAL_ARG,
+        Ast(Tk.TEXT_LINE,"This is another argument.")
+    ])
+])
+
+def ut_parsefunc_argument_list() -> None:
     """ Test `parse_argument_list` function. """
     _test_parser_function(parse_argument_list,
         "ut_parsefunc_argument_list",
         "-f --long-flag-ident123 This is the argument documentation.\n"
                      "-g --another-flag [optional_arg] This is another argument.\n",
-        Ast(Tk.ARGUMENT_LIST,None,branches = [
-            Ast(Tk.ARGUMENT,None,branches = [
-                Ast(Tk.SHORT_FLAG,None,branches = [Ast(Tk.SHORT_FLAG_IDENT,'f')]),
-                Ast(Tk.LONG_FLAG,None,branches = [Ast(Tk.LONG_FLAG_IDENT,'long-flag-ident123')]),
-                Ast(Tk.TEXT_LINE,"This is the argument documentation.")
-            ]),
-            Ast(Tk.ARGUMENT,None,branches = [
-                Ast(Tk.SHORT_FLAG,None,branches = [Ast(Tk.SHORT_FLAG_IDENT,'g')]),
-                Ast(Tk.LONG_FLAG,None,branches = [Ast(Tk.LONG_FLAG_IDENT,'another-flag')]),
-                Ast(Tk.OPTIONAL_ARG,None,branches = [Ast(Tk.SHELL_IDENT,'optional_arg')]),
-                Ast(Tk.TEXT_LINE,"This is another argument.")
-            ])
-        ])
+        _EXPECTED_UT_PARSEFUNC_ARGUMENT_LIST
     )
 
-def ut_parsefunc_section_paragraph():
+_EXPECTED_UT_PARSEFUNC_SECTION_PARAGRAPH = Ast(Tk.SECTION,"Details",branches = [
+    Ast(Tk.PARAGRAPH,None,branches = [
+        Ast(Tk.TEXT_LINE,"This is a paragraph."),
+        Ast(Tk.TEXT_LINE,"This is the second line.")
+    ])
+])
+
+def ut_parsefunc_section_paragraph() -> None:
     """ Test `parse_section` with a paragraph inside. """
     _test_parser_function(parse_section,
         "ut_parsefunc_section_paragraph",
         "Details\n    This is a paragraph.\n    This is the second line.\n",
-        Ast(Tk.SECTION,"Details",branches = [
-            Ast(Tk.PARAGRAPH,None,branches = [
-                Ast(Tk.TEXT_LINE,"This is a paragraph."),
-                Ast(Tk.TEXT_LINE,"This is the second line.")
-            ])
-        ])
+        _EXPECTED_UT_PARSEFUNC_SECTION_PARAGRAPH
     )
 
-def ut_parsefunc_section_arguments():
+_EXPECTED_UT_PARSEFUNC_SECTION_ARGUMENTS = Ast(Tk.SECTION,"Options",branches = [
+    Ast(Tk.ARGUMENT_LIST,None,branches = [
+        Ast(Tk.ARGUMENT,None,branches = [
+            _EXPECTED_SHORT_FLAG_F,
+            _EXPECTED_LONG_FLAG_IDENT123,
+            Ast(Tk.TEXT_LINE,"This is the argument documentation.")
+        ]),
+        Ast(Tk.ARGUMENT,None,branches = [
+            Ast(Tk.SHORT_FLAG,None,branches = [Ast(Tk.SHORT_FLAG_IDENT,'g')]),
+            Ast(Tk.LONG_FLAG,None,branches = [Ast(Tk.LONG_FLAG_IDENT,'another-flag')]),
+            _EXPECTED_OPTIONAL_ARG,
+            Ast(Tk.TEXT_LINE,"This is another argument.")
+        ])
+    ])
+])
+
+def ut_parsefunc_section_arguments() -> None:
     """ Test `parse_section` with arguments inside. """
     _test_parser_function(parse_section,
         "ut_parsefunc_section_arguments",
         "Options\n    -f --long-flag-ident123 This is the argument documentation.\n    -g --another-flag [optional_arg] This is another argument.\n",
-        Ast(Tk.SECTION,"Options",branches = [
-            Ast(Tk.ARGUMENT_LIST,None,branches = [
-                Ast(Tk.ARGUMENT,None,branches = [
-                    Ast(Tk.SHORT_FLAG,None,branches = [Ast(Tk.SHORT_FLAG_IDENT,'f')]),
-                    Ast(Tk.LONG_FLAG,None,branches = [Ast(Tk.LONG_FLAG_IDENT,'long-flag-ident123')]),
-                    Ast(Tk.TEXT_LINE,"This is the argument documentation.")
-                ]),
-                Ast(Tk.ARGUMENT,None,branches = [
-                    Ast(Tk.SHORT_FLAG,None,branches = [Ast(Tk.SHORT_FLAG_IDENT,'g')]),
-                    Ast(Tk.LONG_FLAG,None,branches = [Ast(Tk.LONG_FLAG_IDENT,'another-flag')]),
-                    Ast(Tk.OPTIONAL_ARG,None,branches = [Ast(Tk.SHELL_IDENT,'optional_arg')]),
-                    Ast(Tk.TEXT_LINE,"This is another argument.")
-                ])
-            ])
-        ])
+        _EXPECTED_UT_PARSEFUNC_SECTION_ARGUMENTS
     )
 
-def ut_parsefunc_usage_section():
+_EXPECTED_UT_PARSEFUNC_USAGE_SECTION = Ast(Tk.USAGE,"myprogram [options] <input_file>")
+
+def ut_parsefunc_usage_section() -> None:
     """ Test `parse_usage_section` function. """
     _test_parser_function(parse_usage_section,
         "ut_parsefunc_usage_section",
         "Usage: myprogram [options] <input_file>\n",
-        Ast(Tk.USAGE,"myprogram [options] <input_file>")
+        _EXPECTED_UT_PARSEFUNC_USAGE_SECTION
     )
 
-def ut_parsefunc_help_text():
+_EXPECTED_UT_PARSEFUNC_HELP_TEXT = Ast(Tk.SYNTAX,None,branches = [
+    Ast(Tk.USAGE,"myprogram [options] <input_file>"),
+    Ast(Tk.PARAGRAPH,None,branches = [
+        Ast(Tk.TEXT_LINE,"This is a paragraph."),
+        Ast(Tk.TEXT_LINE,"This is the second line.")
+    ]),
+    Ast(Tk.SECTION,"Details",branches = [ Ast(Tk.PARAGRAPH,None,branches = [
+        Ast(Tk.TEXT_LINE,"These are the details.")
+    ])
+])
+    ])
+
+def ut_parsefunc_help_text() -> None:
     """ Test `parse_help_text` function. (syntax root) """
     _test_parser_function(parse_help_text,
         "ut_parsefunc_help_text",
         "Usage: myprogram [options] <input_file>\n\nThis is a paragraph.\nThis is the second line.\n\nDetails\n    These are the details.\n\n",
-        Ast(Tk.SYNTAX,None,branches = [
-            Ast(Tk.USAGE,"myprogram [options] <input_file>"),
-            Ast(Tk.PARAGRAPH,None,branches = [
-                Ast(Tk.TEXT_LINE,"This is a paragraph."),
-                Ast(Tk.TEXT_LINE,"This is the second line.")
-            ]),
-            Ast(Tk.SECTION,"Details",branches = [ Ast(Tk.PARAGRAPH,None,branches = [
-                Ast(Tk.TEXT_LINE,"These are the details.")
-            ])
-        ])
-    ])
+        _EXPECTED_UT_PARSEFUNC_HELP_TEXT
     )
 
 ###############################################################################
 # End-To-End Unit Tests
 ###############################################################################
 
-def ut_parser_usage_line():
+_EXPECTED_UT_PARSER_USAGE_LINE = Ast(Tk.SYNTAX,None,branches = [
+    Ast(Tk.USAGE,"myprogram [options] <input_file>")
+])
+
+def ut_parser_usage_line() -> None:
     """ Test parsing a usage line. """
     _test_parser("ut_parser_usage_line",
         "Usage: myprogram [options] <input_file>\n\n",
-        Ast(Tk.SYNTAX,None,branches = [
-            Ast(Tk.USAGE,"myprogram [options] <input_file>")
-        ])
+        _EXPECTED_UT_PARSER_USAGE_LINE
     )
 
-def ut_parser_paragraph():
+_EXPECTED_UT_PARSER_PARAGRAPH = Ast(Tk.SYNTAX,None,branches = [
+    Ast(Tk.PARAGRAPH,None,branches = [
+        Ast(Tk.TEXT_LINE,"This is a paragraph."),
+        Ast(Tk.TEXT_LINE,"This is the second line.")
+    ])
+])
+
+def ut_parser_paragraph() -> None:
     """ Test parsing a paragraph. """
     _test_parser("ut_parser_paragraph",
         "This is a paragraph.\nThis is the second line.\n\n",
-        Ast(Tk.SYNTAX,None,branches = [
-            Ast(Tk.PARAGRAPH,None,branches = [
-                Ast(Tk.TEXT_LINE,"This is a paragraph."),
-                Ast(Tk.TEXT_LINE,"This is the second line.")
-            ])
-        ])
+        _EXPECTED_UT_PARSER_PARAGRAPH
     )
 
-def ut_parser_usage_and_paragraph():
+_EXPECTED_UT_PARSER_USAGE_AND_PARAGRAPH = Ast(Tk.SYNTAX,None,branches = [
+    Ast(Tk.USAGE,"myprogram [options] <input_file>"),
+    Ast(Tk.PARAGRAPH,None,branches = [
+        Ast(Tk.TEXT_LINE,"This is a paragraph."),
+        Ast(Tk.TEXT_LINE,"This is the second line.")
+    ])
+])
+
+def ut_parser_usage_and_paragraph() -> None:
     """Test parsing a usage line and paragraph."""
     _test_parser("ut_parser_usage_and_paragraph",
         "Usage: myprogram [options] <input_file>\n\nThis is a paragraph.\nThis is the second line.\n\n",
-        Ast(Tk.SYNTAX,None,branches = [
-            Ast(Tk.USAGE,"myprogram [options] <input_file>"),
-            Ast(Tk.PARAGRAPH,None,branches = [
-                Ast(Tk.TEXT_LINE,"This is a paragraph."),
-                Ast(Tk.TEXT_LINE,"This is the second line.")
-            ])
-        ])
+        _EXPECTED_UT_PARSER_USAGE_AND_PARAGRAPH
     )
 
-def ut_parser_usage_paragraph_section():
+_EXPECTED_UT_PARSER_USAGE_PARAGRAPH_SECTION = Ast(Tk.SYNTAX,None,branches = [
+    Ast(Tk.USAGE,"myprogram [options] <input_file>"),
+    Ast(Tk.PARAGRAPH,None,branches = [
+        Ast(Tk.TEXT_LINE,"This is a paragraph."),
+        Ast(Tk.TEXT_LINE,"This is the second line.")
+    ]),
+    Ast(Tk.SECTION,"Details",branches = [
+        Ast(Tk.PARAGRAPH,None,branches = [
+            Ast(Tk.TEXT_LINE,"These are the details.")
+        ])
+    ])
+])
+
+def ut_parser_usage_paragraph_section() -> None:
     """Test parsing a usage line, paragraph and section."""
     _test_parser("ut_parser_usage_paragraph_section",
         "Usage: myprogram [options] <input_file>\n\nThis is a paragraph.\nThis is the second line.\n\nDetails\n    These are the details.\n\n",
-        Ast(Tk.SYNTAX,None,branches = [
-            Ast(Tk.USAGE,"myprogram [options] <input_file>"),
-            Ast(Tk.PARAGRAPH,None,branches = [
-                Ast(Tk.TEXT_LINE,"This is a paragraph."),
-                Ast(Tk.TEXT_LINE,"This is the second line.")
-            ]),
-            Ast(Tk.SECTION,"Details",branches = [
-                Ast(Tk.PARAGRAPH,None,branches = [
-                    Ast(Tk.TEXT_LINE,"These are the details.")
-                ])
+        _EXPECTED_UT_PARSER_USAGE_PARAGRAPH_SECTION
+    )
+
+_EXPECTED_UT_PARSER_ARG_LONG_FLAG = Ast(Tk.SYNTAX,None,branches = [
+    Ast(Tk.SECTION,"Options",branches = [
+        Ast(Tk.ARGUMENT_LIST,None,branches = [
+            Ast(Tk.ARGUMENT,None,branches = [
+                _EXPECTED_LONG_FLAG_IDENT123,
+                Ast(Tk.TEXT_LINE,"This is the argument documentation.")
             ])
         ])
-    )
+    ])
+])
 
-def ut_parser_arg_long_flag():
+def ut_parser_arg_long_flag() -> None:
     """Test parsing a long cli argument flag."""
     _test_parser("ut_parser_arg_long_flag",
         "Options\n    --long-flag-ident123 This is the argument documentation.\n\n",
-        Ast(Tk.SYNTAX,None,branches = [
-            Ast(Tk.SECTION,"Options",branches = [
-                Ast(Tk.ARGUMENT_LIST,None,branches = [
-                    Ast(Tk.ARGUMENT,None,branches = [
-                        Ast(Tk.LONG_FLAG,None,branches = [Ast(Tk.LONG_FLAG_IDENT,'long-flag-ident123')]),
-                        Ast(Tk.TEXT_LINE,"This is the argument documentation.")
-                    ])
-                ])
+        _EXPECTED_UT_PARSER_ARG_LONG_FLAG
+    )
+
+_EXPECTED_UT_PARSER_ARG_SHORT_FLAG = Ast(Tk.SYNTAX,None,branches = [
+    Ast(Tk.SECTION,"Options",branches = [
+        Ast(Tk.ARGUMENT_LIST,None,branches = [
+            Ast(Tk.ARGUMENT,None,branches = [
+                _EXPECTED_SHORT_FLAG_F,
+                Ast(Tk.TEXT_LINE,"This is the argument documentation.")
             ])
         ])
-    )
+    ])
+])
 
-def ut_parser_arg_short_flag():
+def ut_parser_arg_short_flag() -> None:
     """Test parsing a short cli argument flag."""
     _test_parser("ut_parser_arg_short_flag",
         "Options\n    -f This is the argument documentation.\n\n",
-        Ast(Tk.SYNTAX,None,branches = [
-            Ast(Tk.SECTION,"Options",branches = [
-                Ast(Tk.ARGUMENT_LIST,None,branches = [
-                    Ast(Tk.ARGUMENT,None,branches = [
-                        Ast(Tk.SHORT_FLAG,None,branches = [Ast(Tk.SHORT_FLAG_IDENT,'f')]),
-                        Ast(Tk.TEXT_LINE,"This is the argument documentation.")
-                    ])
-                ])
+        _EXPECTED_UT_PARSER_ARG_SHORT_FLAG
+    )
+
+_EXPECTED_UT_PARSER_ARG_SHORT_AND_LONG_FLAG = Ast(Tk.SYNTAX,None,branches = [
+    Ast(Tk.SECTION,"Options",branches = [
+        Ast(Tk.ARGUMENT_LIST,None,branches = [
+            Ast(Tk.ARGUMENT,None,branches = [
+                _EXPECTED_SHORT_FLAG_F,
+                _EXPECTED_LONG_FLAG_IDENT123,
+                Ast(Tk.TEXT_LINE,"This is the argument documentation.")
             ])
         ])
-    )
+    ])
+])
 
-def ut_parser_arg_short_and_long_flag():
+def ut_parser_arg_short_and_long_flag() -> None:
     """Test parsing a short and long cli argument flags."""
     _test_parser("ut_parser_arg_short_and_long_flag",
         "Options\n    -f --long-flag-ident123 This is the argument documentation.\n\n",
-        Ast(Tk.SYNTAX,None,branches = [
-            Ast(Tk.SECTION,"Options",branches = [
-                Ast(Tk.ARGUMENT_LIST,None,branches = [
-                    Ast(Tk.ARGUMENT,None,branches = [
-                        Ast(Tk.SHORT_FLAG,None,branches = [Ast(Tk.SHORT_FLAG_IDENT,'f')]),
-                        Ast(Tk.LONG_FLAG,None,branches = [Ast(Tk.LONG_FLAG_IDENT,'long-flag-ident123')]),
-                        Ast(Tk.TEXT_LINE,"This is the argument documentation.")
-                    ])
-                ])
+        _EXPECTED_UT_PARSER_ARG_SHORT_AND_LONG_FLAG
+    )
+
+_EXPECTED_UT_PARSER_ARG_OPTIONAL_ARG = Ast(Tk.SYNTAX,None,branches = [
+    Ast(Tk.SECTION,"Options",branches = [
+        Ast(Tk.ARGUMENT_LIST,None,branches = [
+            Ast(Tk.ARGUMENT,None,branches = [
+                _EXPECTED_LONG_FLAG_IDENT123,
+                _EXPECTED_OPTIONAL_ARG123,
+                Ast(Tk.TEXT_LINE,"This is the argument documentation.")
             ])
         ])
-    )
+    ])
+])
 
-def ut_parser_arg_optional_arg():
+def ut_parser_arg_optional_arg() -> None:
     """Test parsing an optional cli argument."""
     _test_parser("ut_parser_arg_optional_arg",
         "Options\n    --long-flag-ident123 [optional_arg123] This is the argument documentation.\n\n",
-        Ast(Tk.SYNTAX,None,branches = [
-            Ast(Tk.SECTION,"Options",branches = [
-                Ast(Tk.ARGUMENT_LIST,None,branches = [
-                    Ast(Tk.ARGUMENT,None,branches = [
-                        Ast(Tk.LONG_FLAG,None,branches = [Ast(Tk.LONG_FLAG_IDENT,'long-flag-ident123')]),
-                        Ast(Tk.OPTIONAL_ARG,None,branches = [Ast(Tk.SHELL_IDENT,'optional_arg123')]),
-                        Ast(Tk.TEXT_LINE,"This is the argument documentation.")
-                    ])
-                ])
+        _EXPECTED_UT_PARSER_ARG_OPTIONAL_ARG
+    )
+
+_EXPECTED_UT_PARSER_ARG_REQUIRED_ARG = Ast(Tk.SYNTAX,None,branches = [
+    Ast(Tk.SECTION,"Options",branches = [
+        Ast(Tk.ARGUMENT_LIST,None,branches = [
+            Ast(Tk.ARGUMENT,None,branches = [
+                _EXPECTED_LONG_FLAG_IDENT123,
+                _EXPECTED_REQUIRED_ARG123,
+                Ast(Tk.TEXT_LINE,"This is the argument documentation.")
             ])
         ])
-    )
+    ])
+])
 
-def ut_parser_arg_required_arg():
+def ut_parser_arg_required_arg() -> None:
     """Test parsing a required cli argument."""
     _test_parser("ut_parser_arg_required_arg",
         "Options\n    --long-flag-ident123 <required_arg123> This is the argument documentation.\n\n",
-        Ast(Tk.SYNTAX,None,branches = [
-            Ast(Tk.SECTION,"Options",branches = [
-                Ast(Tk.ARGUMENT_LIST,None,branches = [
-                    Ast(Tk.ARGUMENT,None,branches = [
-                        Ast(Tk.LONG_FLAG,None,branches = [Ast(Tk.LONG_FLAG_IDENT,'long-flag-ident123')]),
-                        Ast(Tk.REQUIRED_ARG,None,branches = [Ast(Tk.SHELL_IDENT,'required_arg123')]),
-                        Ast(Tk.TEXT_LINE,"This is the argument documentation.")
-                    ])
-                ])
+        _EXPECTED_UT_PARSER_ARG_REQUIRED_ARG
+    )
+
+_EXPECTED_UT_PARSER_ARG_INDENTED_BRIEF_FOLLOWING_ARG = Ast(Tk.SYNTAX,None,branches = [
+    Ast(Tk.SECTION,"Options",branches = [
+        Ast(Tk.ARGUMENT_LIST,None,branches = [
+            Ast(Tk.ARGUMENT,None,branches = [
+                _EXPECTED_LONG_FLAG_IDENT123,
+                _EXPECTED_REQUIRED_ARG123,
+                Ast(Tk.TEXT_LINE,"This is the argument documentation.")
             ])
         ])
-    )
+    ])
+])
 
-def ut_parser_arg_indented_brief_following_arg():
+def ut_parser_arg_indented_brief_following_arg() -> None:
     """Test parsing an argument with indented brief following."""
     _test_parser("ut_parser_arg_indented_brief_following_arg",
         "Options\n    --long-flag-ident123 <required_arg123>\n        This is the argument documentation.\n\n",
-        Ast(Tk.SYNTAX,None,branches = [
-            Ast(Tk.SECTION,"Options",branches = [
-                Ast(Tk.ARGUMENT_LIST,None,branches = [
-                    Ast(Tk.ARGUMENT,None,branches = [
-                        Ast(Tk.LONG_FLAG,None,branches = [Ast(Tk.LONG_FLAG_IDENT,'long-flag-ident123')]),
-                        Ast(Tk.REQUIRED_ARG,None,branches = [Ast(Tk.SHELL_IDENT,'required_arg123')]),
-                        Ast(Tk.TEXT_LINE,"This is the argument documentation.")
-                    ])
-                ])
+        _EXPECTED_UT_PARSER_ARG_INDENTED_BRIEF_FOLLOWING_ARG
+    )
+
+_EXPECTED_UT_PARSER_ARG_INDENTED_MULTILINE_BRIEF_FOLLOWING_ARG = Ast(Tk.SYNTAX,None,branches = [
+    Ast(Tk.SECTION,"Options",branches = [
+        Ast(Tk.ARGUMENT_LIST,None,branches = [
+            Ast(Tk.ARGUMENT,None,branches = [
+                _EXPECTED_LONG_FLAG_IDENT123,
+                _EXPECTED_REQUIRED_ARG123,
+                Ast(Tk.TEXT_LINE,"This is the argument documentation.")
+                ,Ast(Tk.TEXT_LINE,"This is the second line.")
             ])
         ])
-    )
+    ])
+])
 
-def ut_parser_arg_indented_multiline_brief_following_arg():
+def ut_parser_arg_indented_multiline_brief_following_arg() -> None:
     """Test parsing an argument with a multiline indented brief following."""
     _test_parser("ut_parser_arg_indented_multiline_brief_following_arg",
         "Options\n    --long-flag-ident123 <required_arg123>\n        This is the argument documentation.\n        This is the second line.\n\n",
-        Ast(Tk.SYNTAX,None,branches = [
-            Ast(Tk.SECTION,"Options",branches = [
-                Ast(Tk.ARGUMENT_LIST,None,branches = [
-                    Ast(Tk.ARGUMENT,None,branches = [
-                        Ast(Tk.LONG_FLAG,None,branches = [Ast(Tk.LONG_FLAG_IDENT,'long-flag-ident123')]),
-                        Ast(Tk.REQUIRED_ARG,None,branches = [Ast(Tk.SHELL_IDENT,'required_arg123')]),
-                        Ast(Tk.TEXT_LINE,"This is the argument documentation.")
-                        ,Ast(Tk.TEXT_LINE,"This is the second line.")
-                    ])
-                ])
+        _EXPECTED_UT_PARSER_ARG_INDENTED_MULTILINE_BRIEF_FOLLOWING_ARG
+    )
+
+_EXPECTED_UT_PARSER_SIMPLE = Ast(Tk.SYNTAX,None,branches = [
+    Ast(Tk.USAGE,"py cmhn_compiler.py [ [ -v | --verbose ] | [ -d | --debug ] ] <helpTextInput>"),
+    Ast(Tk.SECTION,"BRIEF:",branches = [
+        Ast(Tk.PARAGRAPH,None,branches = [Ast(Tk.TEXT_LINE,"This is a brief.")
+        ])
+    ]),
+    Ast(Tk.PARAGRAPH,None,branches = [
+        Ast(Tk.TEXT_LINE,"This is a paragraph."),
+        Ast(Tk.TEXT_LINE,"This is the second line.")
+    ]),
+    Ast(Tk.SECTION,"PARAMS:",branches = [
+        Ast(Tk.ARGUMENT_LIST,None,branches = [
+            Ast(Tk.ARGUMENT,None,branches = [
+                _EXPECTED_SHORT_FLAG_F,
+                Ast(Tk.TEXT_LINE,"This is an argument.")
             ])
         ])
-    )
+    ])
+])
 
-def ut_parser_simple():
+def ut_parser_simple() -> None:
     """ Test a simple complete example """
     _test_parser("ut_parser_simple",
         "USAGE:\n"
@@ -596,28 +694,50 @@ def ut_parser_simple():
             +"\n"
             +"\n"
         ,
-        Ast(Tk.SYNTAX,None,branches = [
-            Ast(Tk.USAGE,"py cmhn_compiler.py [ [ -v | --verbose ] | [ -d | --debug ] ] <helpTextInput>"),
-            Ast(Tk.SECTION,"BRIEF:",branches = [
-                Ast(Tk.PARAGRAPH,None,branches = [Ast(Tk.TEXT_LINE,"This is a brief.")
-                ])
+        _EXPECTED_UT_PARSER_SIMPLE
+    )
+
+_EXPECTED_UT_PARSER_FULL = Ast(Tk.SYNTAX,None,branches = [
+    Ast(Tk.USAGE,"gmash dirs prefix --p <prefix> --P [fileOrFolder]"),
+    Ast(Tk.PARAGRAPH,None,branches = [
+        Ast(Tk.TEXT_LINE,"Add a prefix to each top-level file in a directory.")
+    ]),
+    Ast(Tk.SECTION,"Parameters",branches = [
+        Ast(Tk.ARGUMENT_LIST,None,branches = [
+            Ast(Tk.ARGUMENT,None,branches = [
+                _EXPECTED_SHORT_FLAG_F,
+                Ast(Tk.LONG_FLAG,None,branches = [Ast(Tk.LONG_FLAG_IDENT,'force')]),
+                Ast(Tk.TEXT_LINE,"Force changes and overwrite.")
             ]),
-            Ast(Tk.PARAGRAPH,None,branches = [
-                Ast(Tk.TEXT_LINE,"This is a paragraph."),
-                Ast(Tk.TEXT_LINE,"This is the second line.")
+            Ast(Tk.ARGUMENT,None,branches = [
+                _EXPECTED_SHORT_FLAG_H,
+                Ast(Tk.LONG_FLAG,None,branches = [Ast(Tk.LONG_FLAG_IDENT,'husky')]),
+                Ast(Tk.TEXT_LINE,"Use secret husky superpowers.")
+            ])
+        ])
+    ]),
+    Ast(Tk.SECTION,"Display",branches = [
+        Ast(Tk.ARGUMENT_LIST,None,branches = [
+            Ast(Tk.ARGUMENT,None,branches = [
+                _EXPECTED_SHORT_FLAG_H,
+                Ast(Tk.LONG_FLAG,None,branches = [Ast(Tk.LONG_FLAG_IDENT,'help')]),
+                Ast(Tk.TEXT_LINE,"Display help.")
             ]),
-            Ast(Tk.SECTION,"PARAMS:",branches = [
-                Ast(Tk.ARGUMENT_LIST,None,branches = [
-                    Ast(Tk.ARGUMENT,None,branches = [
-                        Ast(Tk.SHORT_FLAG,None,branches = [Ast(Tk.SHORT_FLAG_IDENT,'f')]),
-                        Ast(Tk.TEXT_LINE,"This is an argument.")
-                    ])
-                ])
+            Ast(Tk.ARGUMENT,None,branches = [
+                Ast(Tk.SHORT_FLAG,None,branches = [Ast(Tk.SHORT_FLAG_IDENT,'v')]),
+                Ast(Tk.LONG_FLAG,None,branches = [Ast(Tk.LONG_FLAG_IDENT,'version')]),
+                Ast(Tk.TEXT_LINE,"Display version")
             ])
         ])
-    )
+    ]),
+    Ast(Tk.SECTION,"Details",branches = [
+        Ast(Tk.PARAGRAPH,None,branches = [
+            Ast(Tk.TEXT_LINE,"A paragraph of text, these are the details of a command.")
+        ])
+    ])
+])
 
-def ut_parser_full():
+def ut_parser_full() -> None:
     """Test a full featured example."""
     _test_parser("ut_parser_full",""
         "Usage: gmash dirs prefix --p <prefix> --P [fileOrFolder]\n\n"
@@ -634,57 +754,59 @@ def ut_parser_full():
         "        Display version\n\n"
         "Details\n"
         "    A paragraph of text, these are the details of a command.\n\n\n\n",
-        Ast(Tk.SYNTAX,None,branches = [
-            Ast(Tk.USAGE,"gmash dirs prefix --p <prefix> --P [fileOrFolder]"),
-            Ast(Tk.PARAGRAPH,None,branches = [
-                Ast(Tk.TEXT_LINE,"Add a prefix to each top-level file in a directory.")
-            ]),
-            Ast(Tk.SECTION,"Parameters",branches = [
-                Ast(Tk.ARGUMENT_LIST,None,branches = [
-                    Ast(Tk.ARGUMENT,None,branches = [
-                        Ast(Tk.SHORT_FLAG,None,branches = [Ast(Tk.SHORT_FLAG_IDENT,'f')]),
-                        Ast(Tk.LONG_FLAG,None,branches = [Ast(Tk.LONG_FLAG_IDENT,'force')]),
-                        Ast(Tk.TEXT_LINE,"Force changes and overwrite.")
-                    ]),
-                    Ast(Tk.ARGUMENT,None,branches = [
-                        Ast(Tk.SHORT_FLAG,None,branches = [Ast(Tk.SHORT_FLAG_IDENT,'h')]),
-                        Ast(Tk.LONG_FLAG,None,branches = [Ast(Tk.LONG_FLAG_IDENT,'husky')]),
-                        Ast(Tk.TEXT_LINE,"Use secret husky superpowers.")
-                    ])
-                ])
-            ]),
-            Ast(Tk.SECTION,"Display",branches = [
-                Ast(Tk.ARGUMENT_LIST,None,branches = [
-                    Ast(Tk.ARGUMENT,None,branches = [
-                        Ast(Tk.SHORT_FLAG,None,branches = [Ast(Tk.SHORT_FLAG_IDENT,'h')]),
-                        Ast(Tk.LONG_FLAG,None,branches = [Ast(Tk.LONG_FLAG_IDENT,'help')]),
-                        Ast(Tk.TEXT_LINE,"Display help.")
-                    ]),
-                    Ast(Tk.ARGUMENT,None,branches = [
-                        Ast(Tk.SHORT_FLAG,None,branches = [Ast(Tk.SHORT_FLAG_IDENT,'v')]),
-                        Ast(Tk.LONG_FLAG,None,branches = [Ast(Tk.LONG_FLAG_IDENT,'version')]),
-                        Ast(Tk.TEXT_LINE,"Display version")
-                    ])
-                ])
-            ]),
-            Ast(Tk.SECTION,"Details",branches = [
-                Ast(Tk.PARAGRAPH,None,branches = [
-                    Ast(Tk.TEXT_LINE,"A paragraph of text, these are the details of a command.")
-                ])
-            ])
-        ])
+        _EXPECTED_UT_PARSER_FULL
     )
 
-def ut_parser_usage_with_multiline():
+_EXPECTED_UT_PARSER_USAGE_WITH_MULTILINE = Ast(Tk.SYNTAX,None,branches = [
+    Ast(Tk.USAGE,"myprogram [options] <input_file>\nsecond line of usage text")
+])
+
+def ut_parser_usage_with_multiline() -> None:
     """Test parsing a usage section with multiple usage lines."""
     _test_parser("ut_parser_usage_with_multiline",
         "Usage:\n    myprogram [options] <input_file>\n    second line of usage text\n\n",
-        Ast(Tk.SYNTAX,None,branches = [
-            Ast(Tk.USAGE,"myprogram [options] <input_file>\nsecond line of usage text")
-        ])
+        _EXPECTED_UT_PARSER_USAGE_WITH_MULTILINE
     )
 
-def ut_parser_gmash_dirs_same():
+_EXPECTED_UT_PARSER_GMASH_DIRS_SAME = Ast(Tk.SYNTAX,None,branches = [
+    Ast(Tk.USAGE,"gmash dirs same -p <srcPath> -P <tgtPath>"),
+    Ast(Tk.PARAGRAPH,None,branches = [
+        Ast(Tk.TEXT_LINE,"Get a diff of 2 directories.")
+    ]),
+    Ast(Tk.SECTION,"Parameters:",branches = [
+        Ast(Tk.ARGUMENT_LIST,None,branches = [
+            Ast(Tk.ARGUMENT,None,branches = [
+                Ast(Tk.SHORT_FLAG,None,branches = [Ast(Tk.SHORT_FLAG_IDENT,'p')]),
+                Ast(Tk.LONG_FLAG,None,branches = [Ast(Tk.LONG_FLAG_IDENT,'path')]),
+                Ast(Tk.REQUIRED_ARG,None,branches = [Ast(Tk.SHELL_IDENT,'srcPath')]),
+                Ast(Tk.TEXT_LINE,"Source path.")
+            ]),
+            Ast(Tk.ARGUMENT,None,branches = [
+                Ast(Tk.SHORT_FLAG,None,branches = [Ast(Tk.SHORT_FLAG_IDENT,'P')]),
+                Ast(Tk.LONG_FLAG,None,branches = [Ast(Tk.LONG_FLAG_IDENT,'tgt-path')]),
+                Ast(Tk.REQUIRED_ARG,None,branches = [Ast(Tk.SHELL_IDENT,'tgtPath')]),
+                Ast(Tk.TEXT_LINE,"Target path.")
+            ])
+        ])
+    ]),
+    Ast(Tk.SECTION,"Display:",branches = [
+        Ast(Tk.ARGUMENT_LIST,None,branches = [
+            Ast(Tk.ARGUMENT,None,branches = [
+                _EXPECTED_SHORT_FLAG_H,
+                Ast(Tk.LONG_FLAG,None,branches = [Ast(Tk.LONG_FLAG_IDENT,'help')]),
+                Ast(Tk.TEXT_LINE,"Display gmash, command or subcommand help. Use -h or --help.")
+            ]),
+            Ast(Tk.ARGUMENT,None,branches = [
+                Ast(Tk.SHORT_FLAG,None,branches = [Ast(Tk.SHORT_FLAG_IDENT,'v')]),
+                Ast(Tk.LONG_FLAG,None,branches = [Ast(Tk.LONG_FLAG_IDENT,'version')]),
+                Ast(Tk.OPTIONAL_ARG,None,branches = [Ast(Tk.SHELL_IDENT,'v0-0-0')]),
+                Ast(Tk.TEXT_LINE,"Display command group version.")
+            ])
+        ])
+    ])
+])
+
+def ut_parser_gmash_dirs_same() -> None:
     """Test parsing a real world example from gmash."""
     _test_parser("ut_parser_gmash_dirs_same",
         """Usage: gmash dirs same -p <srcPath> -P <tgtPath>
@@ -700,50 +822,14 @@ Display:
   -v,     --version                     [v0-0-0] Display command group version.
 
         """,
-        Ast(Tk.SYNTAX,None,branches = [
-            Ast(Tk.USAGE,"gmash dirs same -p <srcPath> -P <tgtPath>"),
-            Ast(Tk.PARAGRAPH,None,branches = [
-                Ast(Tk.TEXT_LINE,"Get a diff of 2 directories.")
-            ]),
-            Ast(Tk.SECTION,"Parameters:",branches = [
-                Ast(Tk.ARGUMENT_LIST,None,branches = [
-                    Ast(Tk.ARGUMENT,None,branches = [
-                        Ast(Tk.SHORT_FLAG,None,branches = [Ast(Tk.SHORT_FLAG_IDENT,'p')]),
-                        Ast(Tk.LONG_FLAG,None,branches = [Ast(Tk.LONG_FLAG_IDENT,'path')]),
-                        Ast(Tk.REQUIRED_ARG,None,branches = [Ast(Tk.SHELL_IDENT,'srcPath')]),
-                        Ast(Tk.TEXT_LINE,"Source path.")
-                    ]),
-                    Ast(Tk.ARGUMENT,None,branches = [
-                        Ast(Tk.SHORT_FLAG,None,branches = [Ast(Tk.SHORT_FLAG_IDENT,'P')]),
-                        Ast(Tk.LONG_FLAG,None,branches = [Ast(Tk.LONG_FLAG_IDENT,'tgt-path')]),
-                        Ast(Tk.REQUIRED_ARG,None,branches = [Ast(Tk.SHELL_IDENT,'tgtPath')]),
-                        Ast(Tk.TEXT_LINE,"Target path.")
-                    ])
-                ])
-            ]),
-            Ast(Tk.SECTION,"Display:",branches = [
-                Ast(Tk.ARGUMENT_LIST,None,branches = [
-                    Ast(Tk.ARGUMENT,None,branches = [
-                        Ast(Tk.SHORT_FLAG,None,branches = [Ast(Tk.SHORT_FLAG_IDENT,'h')]),
-                        Ast(Tk.LONG_FLAG,None,branches = [Ast(Tk.LONG_FLAG_IDENT,'help')]),
-                        Ast(Tk.TEXT_LINE,"Display gmash, command or subcommand help. Use -h or --help.")
-                    ]),
-                    Ast(Tk.ARGUMENT,None,branches = [
-                        Ast(Tk.SHORT_FLAG,None,branches = [Ast(Tk.SHORT_FLAG_IDENT,'v')]),
-                        Ast(Tk.LONG_FLAG,None,branches = [Ast(Tk.LONG_FLAG_IDENT,'version')]),
-                        Ast(Tk.OPTIONAL_ARG,None,branches = [Ast(Tk.SHELL_IDENT,'v0-0-0')]),
-                        Ast(Tk.TEXT_LINE,"Display command group version.")
-                    ])
-                ])
-            ])
-        ])
+        _EXPECTED_UT_PARSER_GMASH_DIRS_SAME
     )
 
 ###############################################################################
 # Validation Unit Tests
 ###############################################################################
 
-def ut_generator_basic():
+def ut_generator_basic() -> None:
     """ Hello world generator test """
     _test_generator("ut_generator_hello_world",
         input_string="""
@@ -776,7 +862,7 @@ The world needs a friend, so im saying hello to it.
 """
     )
 
-def ut_generator_self():
+def ut_generator_self() -> None:
     """ Test the generator with its own help text. Skip the first 5 lines (license header)."""
     _test_generator("ut_generator_self",
         input_string="""Usage:
@@ -853,99 +939,109 @@ See "Command Line Help Notation" grammar for details on accepted help text forma
 """
         )
 
+###############################################################################
+# Command Line Unit Tests
+###############################################################################
+
+def ut_cli_output_value_is_not_skip_option() -> None:
+    """ An output file named like a value option is not parsed as that option. """
+    _test_cli("ut_cli_output_value_is_not_skip_option",
+        argv=["Usage: foo", "-o", "--skip", "1"],
+        expected_files=("--skip",))
+
+def ut_cli_output_value_is_not_flag() -> None:
+    """ An output file named like a flag is not parsed as that flag. """
+    _test_cli("ut_cli_output_value_is_not_flag",
+        argv=["Usage: foo", "-o", "-r"],
+        expected_files=("-r",))
+
+def ut_cli_skip_non_newline_line_breaks() -> None:
+    """ Skipped lines end at the same line breaks the parser splits on. """
+    _test_cli("ut_cli_skip_non_newline_line_breaks",
+        argv=["hdr\rUsage:\r    foo <x>\r", "-s", "1", "-o", "out.md"],
+        expected_files=("out.md",))
+
 ###############################################################################
 # Test Driver
-# You may selectivley comment out tests in the run_unit_tests function
-# to debug during development. That's why I'm keeping the duplicate code in a
-# map and function.
+# Tests are run in table order, grouped by suite. You may selectively comment
+# out entries in `_UT_SUITES` to debug during development.
 ###############################################################################
 
-def run_unit_tests():
+_UT_SUITES : tuple = (
+    ("Running bottom-up tests:", (
+        ut_parsefunc_long_flag,
+        ut_parsefunc_short_flag,
+        ut_parsefunc_optional_arg,
+        ut_parsefunc_required_arg,
+        ut_parsefunc_argument_shortflag_only,
+        ut_parsefunc_argument_longflag_only,
+        ut_parsefunc_argument_long_and_short_flag,
+        ut_parsefunc_argument_required_arg,
+        ut_parsefunc_argument_optional_arg,
+        ut_parsefunc_argument_desc_same_line,
+        ut_parsefunc_argument_indented_brief_following_arg,
+        ut_parsefunc_argument_full,
+        ut_parsefunc_argument_full_with_commas,
+        ut_parsefunc_argument_list,
+        ut_parsefunc_section_paragraph,
+        ut_parsefunc_section_arguments,
+        ut_parsefunc_usage_section,
+        ut_parsefunc_help_text,
+    )),
+    ("Running end-to-end tests:", (
+        ut_parser_usage_line,
+        ut_parser_paragraph,
+        ut_parser_usage_and_paragraph,
+        ut_parser_usage_paragraph_section,
+        ut_parser_arg_long_flag,
+        ut_parser_arg_short_flag,
+        ut_parser_arg_short_and_long_flag,
+        ut_parser_arg_optional_arg,
+        ut_parser_arg_required_arg,
+        ut_parser_arg_indented_brief_following_arg,
+        ut_parser_arg_indented_multiline_brief_following_arg,
+        ut_parser_simple,
+        ut_parser_full,
+        ut_parser_usage_with_multiline,
+        ut_parser_gmash_dirs_same,
+    )),
+    ("Running Validation tests:", (
+        ut_generator_basic,
+        ut_generator_self,
+    )),
+    ("Running command line tests:", (
+        ut_cli_output_value_is_not_skip_option,
+        ut_cli_output_value_is_not_flag,
+        ut_cli_skip_non_newline_line_breaks,
+    )),
+)
+
+@contextlib.contextmanager
+def _batched_output() -> Iterator[None]:
+    """ Collect everything printed to stdout in a buffer and write it to the
+        real stdout once, on exit (also when a test raises).
+    """
+    real_stdout = sys.stdout
+    buffer = io.StringIO()
+    sys.stdout = buffer
+    try:
+        yield
+    finally:
+        sys.stdout = real_stdout
+        real_stdout.write(buffer.getvalue())
+        real_stdout.flush()
+
+def run_unit_tests() -> None:
     """ Run all unit tests. """
-    print_action("[helptext] Unit Tests")
-
-    print_action("Running bottom-up tests:")
-    ut_parsefunc_long_flag()
-    ut_parsefunc_short_flag()
-    ut_parsefunc_optional_arg()
-    ut_parsefunc_required_arg()
-    ut_parsefunc_argument_shortflag_only()
-    ut_parsefunc_argument_longflag_only()
-    ut_parsefunc_argument_long_and_short_flag()
-    ut_parsefunc_argument_required_arg()
-    ut_parsefunc_argument_optional_arg()
-    ut_parsefunc_argument_desc_same_line()
-    ut_parsefunc_argument_indented_brief_following_arg()
-    ut_parsefunc_argument_full()
-    ut_parsefunc_argument_full_with_commas()
-    ut_parsefunc_argument_list()
-    ut_parsefunc_section_paragraph()
-    ut_parsefunc_section_arguments()
-    ut_parsefunc_usage_section()
-    ut_parsefunc_help_text()
-
-    print_action("Running end-to-end tests:")
-    ut_parser_usage_line()
-    ut_parser_paragraph()
-    ut_parser_usage_and_paragraph()
-    ut_parser_usage_paragraph_section()
-    ut_parser_arg_long_flag()
-    ut_parser_arg_short_flag()
-    ut_parser_arg_short_and_long_flag()
-    ut_parser_arg_optional_arg()
-    ut_parser_arg_required_arg()
-    ut_parser_arg_indented_brief_following_arg()
-    ut_parser_arg_indented_multiline_brief_following_arg()
-    ut_parser_simple()
-    ut_parser_full()
-    ut_parser_usage_with_multiline()
-    ut_parser_gmash_dirs_same()
-
-    # Generator tests
-    print_action("Running Validation tests:")
-    ut_generator_basic()
-    ut_generator_self()
-
-CMNH_TEST_MAP : dict = {
-    # Bottom up tests
-    "ut_parsefunc_long_flag": ut_parsefunc_long_flag
-    ,"ut_parsefunc_short_flag": ut_parsefunc_short_flag
-    ,"ut_parsefunc_optional_arg": ut_parsefunc_optional_arg
-    ,"ut_parsefunc_required_arg": ut_parsefunc_required_arg
-    ,"ut_parsefunc_argument_shortflag_only": ut_parsefunc_argument_shortflag_only
-    ,"ut_parsefunc_argument_longflag_only": ut_parsefunc_argument_longflag_only
-    ,"ut_parsefunc_argument_long_and_short_flag": ut_parsefunc_argument_long_and_short_flag
-    ,"ut_parsefunc_argument_required_arg": ut_parsefunc_argument_required_arg
-    ,"ut_parsefunc_argument_optional_arg": ut_parsefunc_argument_optional_arg
-    ,"ut_parsefunc_argument_desc_same_line": ut_parsefunc_argument_desc_same_line
-    , "ut_parsefunc_argument_indented_brief_following_arg": ut_parsefunc_argument_indented_brief_following_arg
-    , "ut_parsefunc_argument_full" : ut_parsefunc_argument_full
-    , "ut_parsefunc_argument_full_with_commas" : ut_parsefunc_argument_full_with_commas
-    ,"ut_parsefunc_argument_list": ut_parsefunc_argument_list
-    ,"ut_parsefunc_section_paragraph": ut_parsefunc_section_paragraph
-    ,"ut_parsefunc_section_arguments": ut_parsefunc_section_arguments
-    ,"ut_parsefunc_usage_section": ut_parsefunc_usage_section
-    ,"ut_parsefunc_help_text": ut_parsefunc_help_text
-
-    # Top down tests
-    ,"ut_parser_usage_line": ut_parser_usage_line
-    ,"ut_parser_paragraph": ut_parser_paragraph
-    ,"ut_parser_usage_and_paragraph": ut_parser_usage_and_paragraph
-    ,"ut_parser_usage_paragraph_section": ut_parser_usage_paragraph_section
-    ,"ut_parser_arg_long_flag": ut_parser_arg_long_flag
-    ,"ut_parser_arg_short_flag": ut_parser_arg_short_flag
-    ,"ut_parser_arg_short_and_long_flag": ut_parser_arg_short_and_long_flag
-    ,"ut_parser_arg_optional_arg": ut_parser_arg_optional_arg
-    ,"ut_parser_arg_required_arg": ut_parser_arg_required_arg
-    ,"ut_parser_arg_indented_brief_following_arg": ut_parser_arg_indented_brief_following_arg
-    ,"ut_parser_arg_indented_multiline_brief_following_arg": ut_parser_arg_indented_multiline_brief_following_arg
-    ,"ut_parser_simple" : ut_parser_simple
-    ,"ut_parser_full": ut_parser_full
-    ,"ut_parser_usage_with_multiline": ut_parser_usage_with_multiline
-    ,"ut_parser_gmash_dirs_same": ut_parser_gmash_dirs_same
-
-    # Generator tests
-    ,"ut_generator_basic": ut_generator_basic
-    , "ut_generator_self" : ut_generator_self
-
-}
+    with _batched_output():
+        print_action("[helptext] Unit Tests")
+        for suite_name, suite_tests in _UT_SUITES:
+            print_action(suite_name)
+            for test in suite_tests:
+                test()
+
+# (test name, test function) pairs in table order, for scanning by pattern.
+CMNH_TEST_LIST : tuple = tuple((test.__name__, test) for _, suite_tests in _UT_SUITES for test in suite_tests)
+
+# Test name -> test function, for running tests selected by exact name.
+CMNH_TEST_MAP : dict = dict(CMNH_TEST_LIST)